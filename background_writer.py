@@ -0,0 +1,135 @@
+import queue
+import threading
+import time
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """Base dos escritores em segundo plano (SessionWriter, LeaderboardClient).
+
+    submit() só enfileira o item; uma thread junta o que estiver na fila
+    (até batch_size, esperando até flush_interval por mais) e entrega o
+    lote a write_batch(), implementado pela subclasse. flush() espera a
+    fila esvaziar e close() processa o que faltar e encerra a thread.
+    """
+    thread_name = "BackgroundWriter"
+
+    def __init__(self, batch_size=64, flush_interval=0.0, retries=3, backoff=0.2):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self.backoff = backoff
+        self.queue = queue.Queue()
+        self.thread = None
+        self.start_lock = threading.Lock()
+        # Lote que a thread está processando (ver take_pending)
+        self.in_flight = None
+        # True: falhas não são repetidas (subclasses ligam ao encerrar com pressa)
+        self.closing = False
+
+        # Métricas
+        self.retries_made = 0
+        self.errors = 0
+
+    def start(self):
+        with self.start_lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name=self.thread_name, daemon=True)
+                self.thread.start()
+
+    def submit(self, **item):
+        self.start()
+        self.queue.put(item)
+
+    def queue_depth(self):
+        return self.queue.qsize()
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                self.queue.task_done()
+                return
+
+            # Junta o que já estiver na fila, até batch_size, esperando um pouco por mais
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self.in_flight = batch
+            self.write_batch(batch)
+            self.in_flight = None
+            for _ in range(len(batch) + stop):
+                self.queue.task_done()
+            if stop:
+                return
+
+    def write_batch(self, batch):
+        raise NotImplementedError
+
+    def call_with_retry(self, errors, func, *args):
+        """Chama func repetindo as falhas do tipo errors com espera crescente"""
+        for attempt in range(self.retries):
+            try:
+                return func(*args)
+            except errors:
+                if attempt == self.retries - 1 or self.closing:
+                    raise
+                self.retries_made += 1
+                time.sleep(self.backoff * 2 ** attempt)
+
+    def take_pending(self):
+        """Tira da fila o que a thread ainda não processou, junto com o lote em andamento"""
+        items = list(self.in_flight or ())
+        self.in_flight = None
+        stop = False
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self.queue.task_done()
+            if item is _STOP:
+                stop = True
+            else:
+                items.append(item)
+        if stop:
+            # A thread ainda precisa do sinal para encerrar
+            self.queue.put(_STOP)
+        return items
+
+    def flush(self):
+        """Bloqueia até todos os itens enfileirados serem processados"""
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.join()
+
+    def close(self, timeout=None):
+        """Processa o que estiver pendente e encerra a thread.
+
+        Com timeout, espera no máximo timeout segundos e devolve False se a
+        thread ainda não terminou.
+        """
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.put(_STOP)
+            self.thread.join(timeout)
+            if self.thread.is_alive():
+                return False
+        self.thread = None
+        return True
+
+    def get_metrics(self):
+        return {
+            "queue_depth": self.queue_depth(),
+            "retries": self.retries_made,
+            "errors": self.errors
+        }
@@ -0,0 +1,163 @@
+import argparse
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from bots import POLICIES, create_policy
+from config import GameConfig
+from headless import HeadlessGame
+from input_source import PolicyInput
+
+# Limite de frames por sessão (5 minutos de jogo), para bots que não morrem
+DEFAULT_MAX_FRAMES = GameConfig.FPS * 300
+# Largura (s) das faixas do histograma de sobrevivência
+SURVIVAL_BUCKET = 5
+
+
+def build_config(overrides):
+    config = GameConfig()
+    config.RECORD_REPLAYS = False
+    for key, value in overrides.items():
+        if not hasattr(GameConfig, key):
+            raise ValueError(f"Configuração desconhecida: {key}")
+        setattr(config, key, value)
+    return config
+
+
+def simulate(task):
+    """Executa uma sessão headless (roda nos processos do pool)"""
+    seed, policy, overrides, max_frames = task
+    game = HeadlessGame(PolicyInput(create_policy(policy, seed)), build_config(overrides), seed)
+    result = game.run(max_frames)
+    result["policy"] = policy
+    result["overrides"] = overrides
+    return result
+
+
+def run_batch(sessions, policy="dodge", overrides=None, seed=0, max_frames=DEFAULT_MAX_FRAMES, workers=None):
+    """Distribui as sessões (seed, seed+1, ...) entre os núcleos e devolve os resultados conforme chegam"""
+    workers = workers or os.cpu_count() or 1
+    tasks = [(seed + i, policy, overrides or {}, max_frames) for i in range(sessions)]
+    # Blocos de várias sessões por envio: cada sessão leva poucos ms
+    chunksize = max(1, sessions // (workers * 8))
+    with ProcessPoolExecutor(workers) as executor:
+        yield from executor.map(simulate, tasks, chunksize=chunksize)
+
+
+class BatchStats:
+    """Agrega resultados de sessões: distribuição de sobrevivência e curvas por nível"""
+    def __init__(self, fps=GameConfig.FPS):
+        self.fps = fps
+        self.survival = []
+        self.scores = []
+        self.ended_at_level = {}
+        self.scores_at_level = {}
+        self.timeouts = 0
+
+    def add(self, result):
+        self.survival.append(result["frames"] / self.fps)
+        self.scores.append(result["score"])
+        level = result["level"]
+        self.ended_at_level[level] = self.ended_at_level.get(level, 0) + 1
+        self.scores_at_level.setdefault(level, []).append(result["score"])
+        self.timeouts += not result["game_over"]
+
+    def survival_histogram(self):
+        histogram = {}
+        for seconds in self.survival:
+            bucket = int(seconds // SURVIVAL_BUCKET) * SURVIVAL_BUCKET
+            histogram[bucket] = histogram.get(bucket, 0) + 1
+        return dict(sorted(histogram.items()))
+
+    def level_curve(self):
+        """Por nível: fração das sessões que o alcançaram, quantas terminaram nele e o score médio delas"""
+        total = len(self.scores)
+        curve = []
+        reached = total
+        for level in range(1, max(self.ended_at_level, default=0) + 1):
+            ended = self.ended_at_level.get(level, 0)
+            scores = self.scores_at_level.get(level, [])
+            curve.append({
+                "level": level,
+                "reached": reached / total,
+                "ended": ended,
+                "mean_score": statistics.fmean(scores) if scores else 0.0
+            })
+            reached -= ended
+        return curve
+
+    def summary(self):
+        survival = sorted(self.survival)
+        deciles = statistics.quantiles(survival, n=10) if len(survival) > 1 else survival * 9
+        return {
+            "sessions": len(self.scores),
+            "timeouts": self.timeouts,
+            "mean_score": statistics.fmean(self.scores) if self.scores else 0.0,
+            "survival_p10": deciles[0] if deciles else 0.0,
+            "survival_p50": deciles[4] if deciles else 0.0,
+            "survival_p90": deciles[8] if deciles else 0.0,
+            "survival_histogram": self.survival_histogram(),
+            "levels": self.level_curve()
+        }
+
+
+def parse_assignment(text):
+    """'CHAVE=valor' com valor em JSON (números, listas, objetos); senão, texto"""
+    key, _, value = text.partition("=")
+    try:
+        return key, json.loads(value)
+    except json.JSONDecodeError:
+        return key, value
+
+
+def print_summary(label, summary, elapsed):
+    print(f"\n=== {label} ===")
+    print(f"Sessões: {summary['sessions']} em {elapsed:.1f}s ({summary['timeouts']} atingiram o limite de frames)")
+    print(f"Score médio: {summary['mean_score']:.1f}")
+    print(f"Sobrevivência (s): p10 {summary['survival_p10']:.1f}  p50 {summary['survival_p50']:.1f}  "
+          f"p90 {summary['survival_p90']:.1f}")
+    for level in summary["levels"]:
+        print(f"  Nível {level['level']:>2}: alcançado por {level['reached']:6.1%}, "
+              f"terminaram {level['ended']:>5}, score médio {level['mean_score']:.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulação em lote do Square Dodger (ajuste de dificuldade)")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--policy", choices=list(POLICIES), default="dodge")
+    parser.add_argument("--seed", type=int, default=0, help="seed da primeira sessão (as seguintes usam seed+1...)")
+    parser.add_argument("--max-frames", type=int, default=DEFAULT_MAX_FRAMES)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="CHAVE=VALOR",
+                        help="sobrescreve um atributo de GameConfig (valor em JSON)")
+    parser.add_argument("--sweep", metavar="CHAVE=V1,V2,...",
+                        help="roda um lote para cada valor do atributo")
+    parser.add_argument("--output", help="arquivo .jsonl com o resultado de cada sessão")
+    args = parser.parse_args()
+
+    overrides = dict(parse_assignment(text) for text in args.overrides)
+    variants = [({}, "base")]
+    if args.sweep:
+        key, _, values = args.sweep.partition("=")
+        variants = [({key: parse_assignment(f"{key}={value}")[1]}, f"{key}={value}")
+                    for value in values.split(",")]
+
+    output = open(args.output, "w") if args.output else None
+    try:
+        for variant, label in variants:
+            stats = BatchStats(overrides.get("FPS", GameConfig.FPS))
+            start = time.perf_counter()
+            for result in run_batch(args.sessions, args.policy, {**overrides, **variant},
+                                    args.seed, args.max_frames, args.workers):
+                stats.add(result)
+                if output is not None:
+                    output.write(json.dumps(result) + "\n")
+            print_summary(label, stats.summary(), time.perf_counter() - start)
+    finally:
+        if output is not None:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+# Renderização sem janela: precisa valer antes do pygame abrir o display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from collision_system import CollisionSystem
+from config import GameConfig
+from database import GameDatabase, INSERT_SESSION_SQL, session_epoch
+from enemy_factory import EnemyFactory
+from enemy_registry import ENEMY_TYPES
+from game import Game
+from headless import HeadlessGame
+from input_source import ScriptedInput
+from particle_system import ParticleSystem
+
+# Formato do arquivo de resultados
+RESULTS_VERSION = 1
+BENCH_SEED = 1234
+ENEMY_COUNTS = (6, 12, 100, 1000)
+PARTICLE_COUNTS = (100, 1000, 4000)
+DATABASE_ROWS = (1_000, 10_000, 100_000, 1_000_000)
+QUICK_DATABASE_ROWS = (1_000, 10_000)
+
+
+def measure(func, number, repeat=5):
+    """Tempo por chamada de func (em µs): mediana e mínimo entre as repetições"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return {
+        "median_us": statistics.median(samples) * 1e6,
+        "min_us": min(samples) * 1e6,
+        "number": number,
+        "repeat": repeat
+    }
+
+
+def scaled(number, quick):
+    return max(1, number // 10) if quick else number
+
+
+def bench_config(enemies, engine="objects"):
+    config = GameConfig()
+    config.MAX_ENEMIES = enemies
+    config.ENEMY_ENGINE = engine
+    config.RECORD_REPLAYS = False
+    return config
+
+
+def fill_enemies(game, count):
+    while game.enemy_count() < count:
+        game.add_new_enemy()
+
+
+class BenchGame(HeadlessGame):
+    """HeadlessGame com N inimigos em que a colisão não encerra a partida"""
+    def __init__(self, enemies, engine="objects"):
+        super().__init__(ScriptedInput([1, 4, 2, 8], loop=True), bench_config(enemies, engine), BENCH_SEED)
+        fill_enemies(self, enemies)
+
+    def handle_game_over(self):
+        # A colisão é detectada normalmente, mas a partida continua com os N inimigos
+        pass
+
+
+class RenderBenchGame(BenchGame):
+    """BenchGame com a janela e o render do Game (display dummy)"""
+    setup_window = Game.setup_window
+    render = Game.render
+
+
+def bench_update(quick):
+    for engine in ("objects", "arrays"):
+        for enemies in ENEMY_COUNTS:
+            game = BenchGame(enemies, engine)
+            number = scaled(2000 if enemies <= 100 else 200, quick)
+            yield f"update.{engine}.{enemies}", measure(game.update, number)
+
+
+def bench_collision(quick):
+    rng = random.Random(BENCH_SEED)
+    width, height = GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT
+    player = pygame.sprite.Sprite()
+    # Fora da tela: nenhuma colisão, então a lista inteira é percorrida
+    player.rect = pygame.Rect(-1000, -1000, 30, 30)
+    system = CollisionSystem()
+    # Um de cada tipo registrado, em rodízio
+    enemy_types = list(ENEMY_TYPES)
+    for count in ENEMY_COUNTS:
+        enemies = [EnemyFactory.create_enemy(enemy_types[i % len(enemy_types)], width, height, rng=rng)
+                   for i in range(count)]
+        number = scaled(20000 if count <= 100 else 1000, quick)
+        yield f"collision.linear.{count}", measure(
+            lambda: system.check_collisions(player, enemies, GameConfig.COLLISION_BUFFER), number)
+        # Grade espacial: sincronização com os inimigos e consulta, medidas separadamente
+        yield f"collision.grid_update.{count}", measure(lambda: system.update_broad_phase(enemies), number)
+        yield f"collision.grid_query.{count}", measure(
+            lambda: system.query_rect(player.rect, GameConfig.COLLISION_BUFFER), number)
+
+
+def spawn_particles(count):
+    colors = [(255, 50, 50), (50, 255, 50), (50, 50, 255), (255, 165, 0)]
+    particles = ParticleSystem(capacity=count, seed=BENCH_SEED)
+    for i in range(count // 10):
+        particles.add_explosion(250, 250, colors[i % len(colors)], 10)
+    # Vida longa para a contagem não cair durante a medição
+    particles.life[:particles.count] = 10 ** 9
+    return particles
+
+
+def bench_particles(quick):
+    pygame.init()
+    surface = pygame.Surface((GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT))
+    for count in PARTICLE_COUNTS:
+        particles = spawn_particles(count)
+        yield f"particles.update.{count}", measure(particles.update, scaled(1000, quick))
+        # update encolhe as partículas até o tamanho 0 (nada a desenhar): draw mede um sistema novo
+        particles = spawn_particles(count)
+        yield f"particles.draw.{count}", measure(lambda: particles.draw(surface), scaled(200, quick))
+
+
+def bench_render(quick):
+    for mode in ("full", "dirty"):
+        for enemies in (12, 100):
+            game = RenderBenchGame(enemies)
+            game.config.RENDER_MODE = mode
+            for _ in range(60):
+                game.update()
+
+            def frame():
+                game.update()
+                game.render()
+            yield f"render.{mode}.{enemies}", measure(frame, scaled(300, quick))
+    pygame.quit()
+
+
+def populate_database(db, rows):
+    rng = random.Random(BENCH_SEED)
+    players = [f"Player{i}" for i in range(50)]
+    now = datetime.datetime.now()
+    batch = []
+    with db.lock, db.conn:
+        for _ in range(rows):
+            date = (now - datetime.timedelta(seconds=rng.randrange(90 * 86400))).strftime("%Y-%m-%d %H:%M:%S")
+            score = rng.randrange(60, 6000)
+            batch.append((rng.choice(players), score, score // GameConfig.LEVEL_UP_SCORE + 1,
+                          score // GameConfig.FPS, rng.randrange(50), date, session_epoch(date), None))
+            if len(batch) >= 10000:
+                db.conn.executemany(INSERT_SESSION_SQL, batch)
+                batch.clear()
+        db.conn.executemany(INSERT_SESSION_SQL, batch)
+    db.rebuild_summaries()
+
+
+def bench_database(quick):
+    session = {"score": 1500, "level": 5, "time_played": 25, "enemies_dodged": 10, "player_name": "Bench"}
+    for rows in QUICK_DATABASE_ROWS if quick else DATABASE_ROWS:
+        directory = tempfile.mkdtemp(prefix="sqd_bench_")
+        try:
+            db = GameDatabase(os.path.join(directory, "bench.db"))
+            populate_database(db, rows)
+            yield f"database.{rows}.insert", measure(lambda: db.save_game_session(**session), 50)
+            yield f"database.{rows}.insert_batch64", measure(lambda: db.save_game_sessions([session] * 64), 10)
+            yield f"database.{rows}.high_scores10", measure(lambda: db.get_high_scores(10), 200)
+            yield f"database.{rows}.high_scores500", measure(lambda: db.get_high_scores(500), 20)
+            yield f"database.{rows}.player_stats", measure(lambda: db.get_player_stats("Player7"), 200)
+            yield f"database.{rows}.history7", measure(lambda: db.get_game_history(7), 5, 3)
+        finally:
+            GameDatabase.close_all()
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+SUITES = {
+    "update": bench_update,
+    "collision": bench_collision,
+    "particles": bench_particles,
+    "render": bench_render,
+    "database": bench_database
+}
+
+
+def run_benchmarks(suites, quick=False):
+    results = {}
+    for suite in suites:
+        for name, result in SUITES[suite](quick):
+            results[name] = result
+            print(f"{name:<36} {result['median_us']:12.1f} µs  (mín {result['min_us']:.1f})")
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "quick": quick,
+        "results": results
+    }
+
+
+def compare(baseline, current, threshold):
+    """Lista (nome, antes, depois, variação) e quantas medições pioraram além do limite"""
+    rows = []
+    regressions = 0
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        change = result["median_us"] / before["median_us"] - 1 if before["median_us"] else 0.0
+        regressed = change > threshold
+        regressions += regressed
+        rows.append((name, before["median_us"], result["median_us"], change, regressed))
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do Square Dodger")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run")
+    run_parser.add_argument("--suite", action="append", choices=list(SUITES),
+                            help="suite a executar (repetível; padrão: todas)")
+    run_parser.add_argument("--quick", action="store_true", help="menos iterações e bancos de até 10k linhas")
+    run_parser.add_argument("--output", default="benchmark_results.json")
+    compare_parser = subparsers.add_parser("compare")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="piora relativa da mediana considerada regressão (padrão 0.10)")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run_benchmarks(args.suite or list(SUITES), args.quick)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Resultados gravados em {args.output}")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    rows, regressions = compare(baseline, current, args.threshold)
+    for name, before, after, change, regressed in rows:
+        flag = "REGRESSÃO" if regressed else ""
+        print(f"{name:<36} {before:12.1f} {after:12.1f} µs {change:+8.1%} {flag}")
+    print(f"{regressions} regressão(ões) acima de {args.threshold:.0%}")
+    raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
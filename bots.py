@@ -0,0 +1,84 @@
+import random
+from input_source import INPUT_LEFT, INPUT_RIGHT, INPUT_UP, INPUT_DOWN
+
+# Máscaras das oito direções (mais "parado")
+DIRECTIONS = (0, INPUT_LEFT, INPUT_RIGHT, INPUT_UP, INPUT_DOWN,
+              INPUT_LEFT | INPUT_UP, INPUT_LEFT | INPUT_DOWN,
+              INPUT_RIGHT | INPUT_UP, INPUT_RIGHT | INPUT_DOWN)
+
+
+def direction_mask(dx, dy, deadzone=0.0):
+    """Máscara de entrada que move o jogador no sentido de (dx, dy)"""
+    mask = 0
+    if dx < -deadzone:
+        mask |= INPUT_LEFT
+    elif dx > deadzone:
+        mask |= INPUT_RIGHT
+    if dy < -deadzone:
+        mask |= INPUT_UP
+    elif dy > deadzone:
+        mask |= INPUT_DOWN
+    return mask
+
+
+class IdlePolicy:
+    """Não se move (referência: sobrevivência só por sorte)"""
+    def __init__(self, seed=None):
+        pass
+
+    def __call__(self, game):
+        return 0
+
+
+class RandomWalkPolicy:
+    """Anda em uma direção aleatória por alguns frames antes de trocar"""
+    def __init__(self, seed=None, hold=20):
+        self.rng = random.Random(seed)
+        self.hold = hold
+        self.mask = 0
+        self.frames = 0
+
+    def __call__(self, game):
+        if self.frames <= 0:
+            self.mask = self.rng.choice(DIRECTIONS)
+            self.frames = self.rng.randint(1, self.hold)
+        self.frames -= 1
+        return self.mask
+
+
+class DodgePolicy:
+    """Foge dos inimigos dentro do raio e, sem ameaça por perto, volta ao centro"""
+    def __init__(self, seed=None, radius=120, center_pull=0.00002):
+        self.radius = radius
+        self.center_pull = center_pull
+
+    def __call__(self, game):
+        player = game.player.rect
+        px, py = player.center
+        radius_sq = self.radius * self.radius
+        force_x = force_y = 0.0
+        for rect in game.enemy_rects():
+            dx = px - rect.centerx
+            dy = py - rect.centery
+            distance_sq = dx * dx + dy * dy
+            if distance_sq < radius_sq:
+                # Repulsão proporcional a 1/distância
+                weight = 1.0 / max(distance_sq, 1)
+                force_x += dx * weight
+                force_y += dy * weight
+
+        force_x += (game.world_width / 2 - px) * self.center_pull
+        force_y += (game.world_height / 2 - py) * self.center_pull
+        return direction_mask(force_x, force_y, 0.001)
+
+
+# Políticas disponíveis para simulações em lote (nome -> classe construída com a seed)
+POLICIES = {
+    "idle": IdlePolicy,
+    "random": RandomWalkPolicy,
+    "dodge": DodgePolicy
+}
+
+
+def create_policy(name, seed=None):
+    return POLICIES[name](seed)
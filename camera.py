@@ -0,0 +1,25 @@
+import pygame
+
+
+class Camera:
+    """Janela de visão sobre o mundo, centrada no jogador e limitada às bordas.
+
+    Com o mundo do tamanho da tela o deslocamento é sempre (0, 0).
+    """
+    def __init__(self, view_width, view_height, world_width, world_height):
+        self.view = pygame.Rect(0, 0, view_width, view_height)
+        self.world = pygame.Rect(0, 0, world_width, world_height)
+
+    @property
+    def offset(self):
+        return self.view.x, self.view.y
+
+    def follow(self, rect):
+        self.view.center = rect.center
+        self.view.clamp_ip(self.world)
+
+    def is_visible(self, rect):
+        return self.view.colliderect(rect)
+
+    def to_screen(self, rect):
+        return rect.move(-self.view.x, -self.view.y)
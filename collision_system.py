@@ -1,16 +1,52 @@
-import pygame
+from spatial_hash import SpatialHash, rects_overlap
 
 class CollisionSystem:
+    def __init__(self, cell_size=64):
+        # Grade espacial para consultas avulsas (query_rect, colliding_pairs, nearest).
+        # O passo do jogo usa check_collisions: sincronizar a grade com todos os
+        # inimigos a cada passo, em Python, custa mais que o teste linear
+        self.broad_phase = SpatialHash(cell_size)
+
     @staticmethod
     def check_collision(rect1, rect2, buffer=0):
         """Verifica colisão com buffer opcional"""
-        return rect1.colliderect(pygame.Rect(rect2.x - buffer, rect2.y - buffer, 
-                                           rect2.width + buffer * 2, rect2.height + buffer * 2))
-    
+        return rects_overlap(rect1.x, rect1.y, rect1.width, rect1.height,
+                             rect2.x - buffer, rect2.y - buffer,
+                             rect2.width + buffer * 2, rect2.height + buffer * 2)
+
     @staticmethod
     def check_collisions(player, enemies, buffer=0):
         """Verifica colisões entre jogador e lista de inimigos"""
         for enemy in enemies:
             if CollisionSystem.check_collision(player.rect, enemy.rect, buffer):
                 return enemy
-        return None
\ No newline at end of file
+        return None
+
+    def update_broad_phase(self, entities):
+        """Atualiza a grade com as posições atuais, removendo entidades que saíram da lista"""
+        broad_phase = self.broad_phase
+        for entity in entities:
+            rect = entity.rect
+            broad_phase.update(entity, rect.x, rect.y, rect.width, rect.height)
+        if len(broad_phase) != len(entities):
+            current = set(entities)
+            for entity in [key for key in broad_phase.entries if key not in current]:
+                broad_phase.remove(entity)
+
+    def query_rect(self, rect, buffer=0):
+        """Entidades da broad phase que sobrepõem rect (após update_broad_phase)"""
+        return self.broad_phase.query_rect(rect.x, rect.y, rect.width, rect.height, buffer)
+
+    def find_near(self, player, enemies, margin):
+        """Inimigos a até margin pixels do jogador (quase-colisões, ver telemetry.py)"""
+        # Expandir o jogador equivale a expandir cada inimigo, com um único Rect
+        area = player.rect.inflate(margin * 2, margin * 2)
+        return [enemy for enemy in enemies if area.colliderect(enemy.rect)]
+
+    def colliding_pairs(self, buffer=0):
+        """Todos os pares de entidades da broad phase que colidem entre si"""
+        return self.broad_phase.all_pairs(buffer)
+
+    def nearest(self, x, y, count=1):
+        """As count entidades mais próximas do ponto"""
+        return self.broad_phase.nearest(x, y, count)
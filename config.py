@@ -1,9 +1,60 @@
 class GameConfig:
+    WINDOW_TITLE = "Square Dodger - Enhanced"
+    # Caminhos das fontes já resolvidos (evita enumerar as fontes do sistema a cada início)
+    FONT_CACHE_FILE = ".font_cache.json"
     SCREEN_WIDTH = 500
     SCREEN_HEIGHT = 500
+    # Modo arena: mundo maior que a janela, com câmera seguindo o jogador (None = tamanho da janela)
+    WORLD_WIDTH = None
+    WORLD_HEIGHT = None
+    # Na arena, inimigos mais distantes que LOD_DISTANCE do jogador avançam a cada
+    # LOD_INTERVAL passos, com deslocamento proporcional
+    LOD_DISTANCE = 800
+    LOD_INTERVAL = 4
+    ARENA_GRID_SIZE = 100
+    # Passos de simulação por segundo (fixo, independente da renderização)
     FPS = 60
+    MAX_RENDER_FPS = 144
+    # Máximo de passos por frame ao recuperar atraso em máquinas lentas
+    MAX_STEPS_PER_FRAME = 5
+    # Deslocamentos maiores num único passo (respawn, reset) não são interpolados
+    MAX_INTERPOLATION_DISTANCE = 50
     PLAYER_SPEED = 5
     BASE_ENEMY_SPEED = 3
     MAX_ENEMIES = 12
+    # Inimigos pré-alocados por tipo no pool (até MAX_ENEMIES); além disso o pool cresce sob demanda
+    ENEMY_POOL_RESERVE = 32
     LEVEL_UP_SCORE = 300
-    COLLISION_BUFFER = -2
\ No newline at end of file
+    # Substitui o peso de sorteio declarado por tipos de inimigo (ver enemy_registry.py):
+    # {"zigzag": (base, incremento por nível, limite), ...}
+    ENEMY_SPAWN_WEIGHTS = {}
+    # Aumentos aplicados a todos os inimigos a cada nível
+    ENEMY_SPEED_STEP = 0.2
+    OSCILLATION_SPEED_STEP = 0.005
+    HOMING_STRENGTH_STEP = 0.002
+    MAX_HOMING_STRENGTH = 0.1
+    COLLISION_BUFFER = -2
+    # "objects" (entities/enemy.py) ou "arrays" (enemy_store.py, NumPy). "arrays" só tem
+    # os quatro tipos embutidos (basic, zigzag, homing, diagonal): com outros tipos
+    # registrados em enemy_registry, o Game recusa o modo "arrays"
+    ENEMY_ENGINE = "objects"
+    # "full" (fill + flip) ou "dirty" (só as regiões que mudaram)
+    RENDER_MODE = "full"
+    # Grava cada sessão (seed + entrada por frame) para replay e verificação
+    RECORD_REPLAYS = True
+    REPLAY_DIR = "replays"
+    # Profiler de frame (overlay com F3) e arquivo .json/.csv exportado ao sair (None = não exporta).
+    # Desligado por padrão: medir cada seção e cada inimigo tem custo por passo
+    PROFILER_ENABLED = False
+    PROFILE_EXPORT_PATH = None
+    # Telemetria (desvios, quase-colisões, níveis, mortes por tipo) gravada em lote no banco
+    TELEMETRY_ENABLED = True
+    TELEMETRY_BUFFER_SIZE = 4096
+    # Distância (px) do jogador a partir da qual um inimigo conta como quase-colisão
+    NEAR_MISS_MARGIN = 20
+    # Leaderboard compartilhado (leaderboard_server.py) como "host:porta"; None = só o banco local
+    LEADERBOARD_SERVER = None
+    # Sessões que não puderam ser enviadas ficam aqui até o servidor voltar
+    LEADERBOARD_SPOOL = "leaderboard_spool.jsonl"
+    # Espera máxima (s) pelo servidor ao sair; o que faltar enviar fica no spool
+    LEADERBOARD_CLOSE_TIMEOUT = 0.5
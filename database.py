@@ -1,141 +1,494 @@
 import sqlite3
 import datetime
+import threading
+
+# SQL fixo: o cache de statements do sqlite3 reaproveita a compilação
+SCHEMA_SQL = '''
+    CREATE TABLE IF NOT EXISTS game_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        player_name TEXT DEFAULT 'Player',
+        score INTEGER NOT NULL,
+        level INTEGER NOT NULL,
+        time_played INTEGER NOT NULL,
+        enemies_dodged INTEGER NOT NULL,
+        session_date TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS game_settings (
+        id INTEGER PRIMARY KEY,
+        setting_name TEXT UNIQUE NOT NULL,
+        setting_value TEXT NOT NULL
+    );
+
+    INSERT OR IGNORE INTO game_settings (id, setting_name, setting_value)
+    VALUES (1, 'player_name', 'Player');
+
+    INSERT OR IGNORE INTO game_settings (id, setting_name, setting_value)
+    VALUES (2, 'difficulty', 'normal');
+'''
+
+# Versão 2: data da sessão como epoch inteiro e índices cobrindo as consultas
+SESSION_INDEXES_SQL = '''
+    ALTER TABLE game_sessions ADD COLUMN session_epoch INTEGER;
+
+    UPDATE game_sessions
+    SET session_epoch = CAST(strftime('%s', session_date, 'utc') AS INTEGER);
+
+    CREATE INDEX IF NOT EXISTS idx_sessions_score
+    ON game_sessions (score DESC, player_name, level, time_played, session_date);
+
+    CREATE INDEX IF NOT EXISTS idx_sessions_player
+    ON game_sessions (player_name, score, level, time_played);
+
+    CREATE INDEX IF NOT EXISTS idx_sessions_epoch
+    ON game_sessions (session_epoch, session_date, player_name, score, level);
+'''
+
+# Quantas sessões a tabela leaderboard mantém
+LEADERBOARD_SIZE = 100
+
+# Versão 3: agregados por jogador e top-N global, mantidos a cada save
+SUMMARY_TABLES_SQL = '''
+    CREATE TABLE IF NOT EXISTS player_summary (
+        player_name TEXT PRIMARY KEY,
+        games_played INTEGER NOT NULL,
+        best_score INTEGER NOT NULL,
+        total_score INTEGER NOT NULL,
+        highest_level INTEGER NOT NULL,
+        total_time_played INTEGER NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS leaderboard (
+        session_id INTEGER PRIMARY KEY,
+        player_name TEXT,
+        score INTEGER NOT NULL,
+        level INTEGER NOT NULL,
+        time_played INTEGER NOT NULL,
+        session_date TEXT NOT NULL
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_leaderboard_score
+    ON leaderboard (score DESC, session_id)
+'''
+
+# Recalcula os agregados a partir de game_sessions (migração e reparo)
+REBUILD_SUMMARY_SQL = f'''
+    DELETE FROM player_summary;
+
+    DELETE FROM leaderboard;
+
+    INSERT INTO player_summary
+    SELECT player_name, COUNT(*), MAX(score), SUM(score), MAX(level), SUM(time_played)
+    FROM game_sessions
+    GROUP BY player_name;
+
+    INSERT INTO leaderboard
+    SELECT id, player_name, score, level, time_played, session_date
+    FROM game_sessions
+    ORDER BY score DESC, id
+    LIMIT {LEADERBOARD_SIZE}
+'''
+
+# Versão 4: seed da sessão, para reproduzir a partida
+SESSION_SEED_SQL = '''
+    ALTER TABLE game_sessions ADD COLUMN seed INTEGER
+'''
+
+# Versão 5: eventos de telemetria (ver telemetry.py), identificados pela seed da sessão
+TELEMETRY_SQL = '''
+    CREATE TABLE IF NOT EXISTS telemetry_events (
+        seed INTEGER,
+        frame INTEGER NOT NULL,
+        event INTEGER NOT NULL,
+        enemy_type TEXT,
+        value REAL NOT NULL
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_telemetry_event
+    ON telemetry_events (event, enemy_type, value)
+'''
+
+# Versão 6: índices na ordem exata das consultas paginadas (HISTORY_PAGE_SQL,
+# HIGH_SCORES_PAGE_SQL), para cada página não ordenar o grupo de empates inteiro
+KEYSET_INDEXES_SQL = '''
+    CREATE INDEX IF NOT EXISTS idx_sessions_score_id
+    ON game_sessions (score DESC, id);
+
+    CREATE INDEX IF NOT EXISTS idx_sessions_epoch_id
+    ON game_sessions (session_epoch DESC, id DESC)
+'''
+
+# Migrações em ordem; PRAGMA user_version guarda a última aplicada
+MIGRATIONS = [
+    (1, SCHEMA_SQL),
+    (2, SESSION_INDEXES_SQL),
+    (3, SUMMARY_TABLES_SQL + ";" + REBUILD_SUMMARY_SQL),
+    (4, SESSION_SEED_SQL),
+    (5, TELEMETRY_SQL),
+    (6, KEYSET_INDEXES_SQL)
+]
+
+INSERT_SESSION_SQL = '''
+    INSERT INTO game_sessions
+    (player_name, score, level, time_played, enemies_dodged, session_date, session_epoch, seed)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+HIGH_SCORES_SQL = '''
+    SELECT player_name, score, level, time_played, session_date
+    FROM game_sessions
+    ORDER BY score DESC
+    LIMIT ?
+'''
+
+LEADERBOARD_SQL = '''
+    SELECT player_name, score, level, time_played, session_date
+    FROM leaderboard
+    ORDER BY score DESC, session_id
+    LIMIT ?
+'''
+
+SESSIONS_BY_SEED_SQL = '''
+    SELECT score, level, time_played, session_date
+    FROM game_sessions
+    WHERE seed = ?
+    ORDER BY id
+'''
+
+TOP_SCORE_SQL = '''
+    SELECT score FROM leaderboard ORDER BY score DESC LIMIT 1
+'''
+
+PLAYER_STATS_SQL = '''
+    SELECT
+        games_played,
+        best_score,
+        total_score * 1.0 / games_played as average_score,
+        highest_level,
+        total_time_played
+    FROM player_summary
+    WHERE player_name = ?
+'''
+
+UPDATE_SUMMARY_SQL = '''
+    INSERT INTO player_summary
+    (player_name, games_played, best_score, total_score, highest_level, total_time_played)
+    VALUES (?, 1, ?, ?, ?, ?)
+    ON CONFLICT (player_name) DO UPDATE SET
+        games_played = games_played + 1,
+        best_score = MAX(best_score, excluded.best_score),
+        total_score = total_score + excluded.total_score,
+        highest_level = MAX(highest_level, excluded.highest_level),
+        total_time_played = total_time_played + excluded.total_time_played
+'''
+
+LAST_SESSION_ID_SQL = '''
+    SELECT COALESCE(MAX(id), 0) FROM game_sessions
+'''
+
+UPDATE_LEADERBOARD_SQL = '''
+    INSERT INTO leaderboard
+    SELECT id, player_name, score, level, time_played, session_date
+    FROM game_sessions
+    WHERE id > ?
+'''
+
+TRIM_LEADERBOARD_SQL = '''
+    DELETE FROM leaderboard
+    WHERE session_id NOT IN (
+        SELECT session_id FROM leaderboard ORDER BY score DESC, session_id LIMIT ?
+    )
+'''
+
+GET_SETTING_SQL = '''
+    SELECT setting_value FROM game_settings WHERE setting_name = ?
+'''
+
+UPDATE_SETTING_SQL = '''
+    INSERT OR REPLACE INTO game_settings (setting_name, setting_value)
+    VALUES (?, ?)
+'''
+
+GAME_HISTORY_SQL = '''
+    SELECT session_date, player_name, score, level
+    FROM game_sessions
+    WHERE session_epoch >= ?
+    ORDER BY session_epoch DESC
+'''
+
+# Consultas paginadas por chave (keyset): cada página continua depois da última
+# linha da anterior, usando o índice em vez de OFFSET
+HISTORY_PAGE_SQL = '''
+    SELECT id, session_epoch, session_date, player_name, score, level
+    FROM game_sessions
+    WHERE session_epoch >= ?
+    ORDER BY session_epoch DESC, id DESC
+    LIMIT ?
+'''
+
+HISTORY_NEXT_PAGE_SQL = '''
+    SELECT id, session_epoch, session_date, player_name, score, level
+    FROM game_sessions
+    WHERE session_epoch >= ? AND (session_epoch, id) < (?, ?)
+    ORDER BY session_epoch DESC, id DESC
+    LIMIT ?
+'''
+
+HIGH_SCORES_PAGE_SQL = '''
+    SELECT id, score, player_name, score, level, time_played, session_date
+    FROM game_sessions
+    ORDER BY score DESC, id
+    LIMIT ?
+'''
+
+HIGH_SCORES_NEXT_PAGE_SQL = '''
+    SELECT id, score, player_name, score, level, time_played, session_date
+    FROM game_sessions
+    WHERE score <= ? AND (score < ? OR id > ?)
+    ORDER BY score DESC, id
+    LIMIT ?
+'''
+
+INSERT_TELEMETRY_SQL = '''
+    INSERT INTO telemetry_events (seed, frame, event, enemy_type, value)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+TELEMETRY_SUMMARY_SQL = '''
+    SELECT event, enemy_type, COUNT(*), AVG(value)
+    FROM telemetry_events
+    GROUP BY event, enemy_type
+    ORDER BY event, COUNT(*) DESC
+'''
+
+SESSION_COLUMNS = ("id", "player_name", "score", "level", "time_played", "enemies_dodged",
+                   "session_date", "session_epoch", "seed")
+
+SESSIONS_PAGE_SQL = f'''
+    SELECT {", ".join(SESSION_COLUMNS)}
+    FROM game_sessions
+    WHERE id > ?
+    ORDER BY id
+    LIMIT ?
+'''
+
+
+def current_session_date():
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def session_epoch(session_date):
+    """Converte a data (hora local) de uma sessão em epoch inteiro"""
+    return int(datetime.datetime.strptime(session_date, "%Y-%m-%d %H:%M:%S").timestamp())
+
+
+def history_start_epoch(days):
+    """Epoch da meia-noite de `days` dias atrás (início da janela do histórico)"""
+    start_date = datetime.datetime.combine(
+        datetime.date.today() - datetime.timedelta(days=days), datetime.time())
+    return int(start_date.timestamp())
+
+
+def split_statements(script):
+    """Separa um script SQL em statements (os scripts de migração não têm ';' em strings)"""
+    return [statement.strip() for statement in script.split(";") if statement.strip()]
+
 
 class GameDatabase:
+    # Uma conexão por arquivo, compartilhada por todas as instâncias do processo
+    connections = {}
+    connections_lock = threading.Lock()
+
     def __init__(self, db_name="game_stats.db"):
         self.db_name = db_name
-        self.init_database()
-    
-    def init_database(self):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS game_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                player_name TEXT DEFAULT 'Player',
-                score INTEGER NOT NULL,
-                level INTEGER NOT NULL,
-                time_played INTEGER NOT NULL,
-                enemies_dodged INTEGER NOT NULL,
-                session_date TEXT NOT NULL
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS game_settings (
-                id INTEGER PRIMARY KEY,
-                setting_name TEXT UNIQUE NOT NULL,
-                setting_value TEXT NOT NULL
-            )
-        ''')
-        
-        cursor.execute('''
-            INSERT OR IGNORE INTO game_settings (id, setting_name, setting_value) 
-            VALUES (1, 'player_name', 'Player')
-        ''')
-        
-        cursor.execute('''
-            INSERT OR IGNORE INTO game_settings (id, setting_name, setting_value) 
-            VALUES (2, 'difficulty', 'normal')
-        ''')
-        
-        conn.commit()
-        conn.close()
-    
-    def save_game_session(self, score, level, time_played, enemies_dodged, player_name=None):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        if player_name is None:
-            player_name = self.get_setting('player_name')
-        
-        current_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        cursor.execute('''
-            INSERT INTO game_sessions 
-            (player_name, score, level, time_played, enemies_dodged, session_date)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (player_name, score, level, time_played, enemies_dodged, current_date))
-        
-        conn.commit()
-        conn.close()
-    
+        self.conn, self.lock = self.get_connection(db_name)
+
+    @classmethod
+    def get_connection(cls, db_name):
+        """Abre (uma única vez por processo) a conexão e inicializa o schema"""
+        with cls.connections_lock:
+            entry = cls.connections.get(db_name)
+            if entry is None:
+                conn = sqlite3.connect(db_name, timeout=5.0,
+                                       check_same_thread=False, cached_statements=64)
+                if db_name != ":memory:":
+                    # WAL permite leitores concorrentes enquanto outro processo grava
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                entry = (conn, threading.RLock())
+                cls.connections[db_name] = entry
+                cls.init_database(conn)
+            return entry
+
+    @classmethod
+    def close_all(cls):
+        """Fecha todas as conexões abertas pelo processo"""
+        with cls.connections_lock:
+            for conn, lock in cls.connections.values():
+                with lock:
+                    conn.close()
+            cls.connections.clear()
+
+    @staticmethod
+    def init_database(conn):
+        """Aplica as migrações pendentes, atualizando bancos antigos no lugar"""
+        for version, script in MIGRATIONS:
+            if GameDatabase.get_schema_version(conn) >= version:
+                continue
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Outro processo pode ter migrado enquanto esperávamos o lock
+                if GameDatabase.get_schema_version(conn) < version:
+                    for statement in split_statements(script):
+                        conn.execute(statement)
+                    conn.execute(f"PRAGMA user_version = {version}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    @staticmethod
+    def get_schema_version(conn):
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def save_game_session(self, score, level, time_played, enemies_dodged, player_name=None, session_date=None, seed=None):
+        self.save_game_sessions([{
+            "score": score,
+            "level": level,
+            "time_played": time_played,
+            "enemies_dodged": enemies_dodged,
+            "player_name": player_name,
+            "session_date": session_date,
+            "seed": seed
+        }])
+
+    def save_game_sessions(self, sessions):
+        """Grava várias sessões (dicts com os argumentos de save_game_session) em uma transação"""
+        with self.lock:
+            default_name = None
+            rows = []
+            for session in sessions:
+                player_name = session.get("player_name")
+                if player_name is None:
+                    if default_name is None:
+                        default_name = self.get_setting('player_name')
+                    player_name = default_name
+                session_date = session.get("session_date") or current_session_date()
+                rows.append((
+                    player_name, session["score"], session["level"], session["time_played"],
+                    session["enemies_dodged"], session_date, session_epoch(session_date),
+                    session.get("seed")))
+
+            # Sessões e agregados na mesma transação. BEGIN IMMEDIATE antes de ler
+            # o último id: outro processo não insere sessões entre a leitura e o INSERT
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                last_id = self.conn.execute(LAST_SESSION_ID_SQL).fetchone()[0]
+                self.conn.executemany(INSERT_SESSION_SQL, rows)
+                self.conn.executemany(UPDATE_SUMMARY_SQL, [
+                    (row[0], row[1], row[1], row[2], row[3]) for row in rows])
+                self.conn.execute(UPDATE_LEADERBOARD_SQL, (last_id,))
+                self.conn.execute(TRIM_LEADERBOARD_SQL, (LEADERBOARD_SIZE,))
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+    def save_telemetry_events(self, rows):
+        """Grava (seed, frame, event, enemy_type, value) em uma transação"""
+        with self.lock:
+            with self.conn:
+                self.conn.executemany(INSERT_TELEMETRY_SQL, rows)
+
+    def get_telemetry_summary(self):
+        """Contagem e valor médio por evento e tipo de inimigo"""
+        with self.lock:
+            return self.conn.execute(TELEMETRY_SUMMARY_SQL).fetchall()
+
+    def rebuild_summaries(self):
+        """Recalcula player_summary e leaderboard a partir de game_sessions"""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                for statement in split_statements(REBUILD_SUMMARY_SQL):
+                    self.conn.execute(statement)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
     def get_high_scores(self, limit=10):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT player_name, score, level, time_played, session_date 
-            FROM game_sessions 
-            ORDER BY score DESC 
-            LIMIT ?
-        ''', (limit,))
-        
-        results = cursor.fetchall()
-        conn.close()
-        
-        return results
-    
+        # O top-N fica pronto na tabela leaderboard; além dele, usa o índice de score
+        sql = LEADERBOARD_SQL if limit <= LEADERBOARD_SIZE else HIGH_SCORES_SQL
+        with self.lock:
+            return self.conn.execute(sql, (limit,)).fetchall()
+
+    def get_top_score(self):
+        with self.lock:
+            result = self.conn.execute(TOP_SCORE_SQL).fetchone()
+
+        return result[0] if result else None
+
+    def get_sessions_by_seed(self, seed):
+        """Sessões gravadas com a seed (score, nível, tempo, data), para conferir replays"""
+        with self.lock:
+            return self.conn.execute(SESSIONS_BY_SEED_SQL, (seed,)).fetchall()
+
     def get_player_stats(self, player_name):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT 
-                COUNT(*) as games_played,
-                MAX(score) as best_score,
-                AVG(score) as average_score,
-                MAX(level) as highest_level,
-                SUM(time_played) as total_time_played
-            FROM game_sessions 
-            WHERE player_name = ?
-        ''', (player_name,))
-        
-        result = cursor.fetchone()
-        conn.close()
-        
-        return result
-    
+        with self.lock:
+            result = self.conn.execute(PLAYER_STATS_SQL, (player_name,)).fetchone()
+
+        # Mesmo formato do antigo COUNT/MAX/AVG quando o jogador não tem sessões
+        return result if result else (0, None, None, None, None)
+
     def get_setting(self, setting_name):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT setting_value FROM game_settings WHERE setting_name = ?
-        ''', (setting_name,))
-        
-        result = cursor.fetchone()
-        conn.close()
-        
+        with self.lock:
+            result = self.conn.execute(GET_SETTING_SQL, (setting_name,)).fetchone()
+
         return result[0] if result else None
-    
+
     def update_setting(self, setting_name, setting_value):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO game_settings (setting_name, setting_value)
-            VALUES (?, ?)
-        ''', (setting_name, setting_value))
-        
-        conn.commit()
-        conn.close()
-    
+        with self.lock, self.conn:
+            self.conn.execute(UPDATE_SETTING_SQL, (setting_name, setting_value))
+
+    def fetch_page(self, sql, params, page_size):
+        with self.lock:
+            cursor = self.conn.execute(sql, (*params, page_size))
+            return cursor.fetchmany(page_size)
+
+    def iter_game_history(self, days=30, page_size=500):
+        """Como get_game_history, mas gera as linhas página a página (memória constante)"""
+        params = (history_start_epoch(days),)
+        page = self.fetch_page(HISTORY_PAGE_SQL, params, page_size)
+        while page:
+            for row in page:
+                yield row[2:]
+            if len(page) < page_size:
+                return
+            last_id, last_epoch = page[-1][0], page[-1][1]
+            page = self.fetch_page(HISTORY_NEXT_PAGE_SQL, (*params, last_epoch, last_id), page_size)
+
+    def iter_high_scores(self, page_size=500):
+        """Todas as sessões por score decrescente, geradas página a página"""
+        page = self.fetch_page(HIGH_SCORES_PAGE_SQL, (), page_size)
+        while page:
+            for row in page:
+                yield row[2:]
+            if len(page) < page_size:
+                return
+            last_id, last_score = page[-1][0], page[-1][1]
+            page = self.fetch_page(HIGH_SCORES_NEXT_PAGE_SQL, (last_score, last_score, last_id), page_size)
+
+    def iter_sessions(self, page_size=1000):
+        """Todas as linhas de game_sessions (colunas em SESSION_COLUMNS), em ordem de id"""
+        last_id = 0
+        while True:
+            page = self.fetch_page(SESSIONS_PAGE_SQL, (last_id,), page_size)
+            yield from page
+            if len(page) < page_size:
+                return
+            last_id = page[-1][0]
+
     def get_game_history(self, days=30):
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        
-        start_date = (datetime.datetime.now() - datetime.timedelta(days=days)).strftime("%Y-%m-%d")
-        
-        cursor.execute('''
-            SELECT session_date, player_name, score, level 
-            FROM game_sessions 
-            WHERE session_date >= ?
-            ORDER BY session_date DESC
-        ''', (start_date,))
-        
-        results = cursor.fetchall()
-        conn.close()
-        
-        return results
\ No newline at end of file
+        with self.lock:
+            return self.conn.execute(GAME_HISTORY_SQL, (history_start_epoch(days),)).fetchall()
@@ -0,0 +1,37 @@
+import pygame
+
+
+class DirtyRectRenderer:
+    """Apaga e envia para a tela só as regiões que mudaram.
+
+    A cada frame o jogo informa os retângulos desenhados; no frame seguinte
+    eles são apagados com a cor de fundo e a tela recebe a união dos
+    retângulos antigos e novos via pygame.display.update(rects). Com
+    retângulos demais (ou após invalidate()) volta ao fill + flip completo.
+    """
+    def __init__(self, background, max_rects=64):
+        self.background = background
+        self.max_rects = max_rects
+        self.previous = []
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Força um redesenho completo no próximo frame"""
+        self.full_redraw = True
+        self.previous = []
+
+    def erase(self, surface):
+        if self.full_redraw:
+            surface.fill(self.background)
+            return
+        for rect in self.previous:
+            surface.fill(self.background, rect)
+
+    def present(self, rects):
+        if self.full_redraw or len(rects) + len(self.previous) > self.max_rects:
+            pygame.display.flip()
+            # Sem os retângulos antigos não há como apagar só o necessário
+            self.full_redraw = len(rects) > self.max_rects
+        else:
+            pygame.display.update(self.previous + rects)
+        self.previous = rects
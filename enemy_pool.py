@@ -0,0 +1,54 @@
+from enemy_registry import ENEMY_TYPES
+from entities.enemy import Enemy
+
+
+class EnemyPool:
+    """Inimigos pré-alocados por tipo, ativados e desativados em vez de recriados.
+
+    active é a lista de inimigos em jogo (Game.enemies aponta para ela).
+    acquire() reativa um inimigo livre do tipo pedido e release_all()
+    devolve todos ao pool, então reiniciar a partida não aloca nada. Se um
+    tipo esgota, o pool cria mais um e o mantém para as próximas partidas.
+    on_reset é repassado a todos os inimigos (ver Enemy.reset).
+    """
+    def __init__(self, width, height, rng, on_reset=None):
+        self.width = width
+        self.height = height
+        self.rng = rng
+        self.on_reset = on_reset
+        self.active = []
+        self.free = {}
+
+    def __len__(self):
+        return len(self.active)
+
+    def reserve(self, enemy_type, count):
+        """Garante pelo menos count inimigos do tipo (ativos + livres)"""
+        enemy_class = ENEMY_TYPES.get(enemy_type, Enemy)
+        free = self.free.setdefault(enemy_class.type_name, [])
+        in_use = sum(1 for enemy in self.active if type(enemy) is enemy_class)
+        for _ in range(count - in_use - len(free)):
+            free.append(self.create(enemy_class))
+
+    def create(self, enemy_class):
+        enemy = enemy_class(self.width, self.height, rng=self.rng, active=False)
+        enemy.on_reset = self.on_reset
+        return enemy
+
+    def acquire(self, enemy_type, player_rect=None):
+        enemy_class = ENEMY_TYPES.get(enemy_type, Enemy)
+        free = self.free.get(enemy_class.type_name)
+        if free:
+            enemy = free.pop()
+        else:
+            enemy = self.create(enemy_class)
+        if enemy_class.tracks_player:
+            enemy.set_player_rect(player_rect)
+        enemy.spawn()
+        self.active.append(enemy)
+        return enemy
+
+    def release_all(self):
+        for enemy in self.active:
+            self.free.setdefault(enemy.type_name, []).append(enemy)
+        self.active.clear()
@@ -0,0 +1,56 @@
+import itertools
+
+# Tipos de inimigo registrados, em ordem de registro (nome -> classe)
+ENEMY_TYPES = {}
+_registry_version = 0
+
+
+def register_enemy_type(enemy_class):
+    """Decorator que registra uma classe de inimigo pelo seu type_name.
+
+    A classe declara:
+      type_name: nome usado no spawn e nos replays
+      spawn_weight: (base, incremento por nível, limite) do peso de sorteio
+      tracks_player: se precisa do retângulo do jogador a cada frame
+      update(steps=1): o kernel de movimento; level_up(config): o aumento de dificuldade
+    """
+    global _registry_version
+    ENEMY_TYPES[enemy_class.type_name] = enemy_class
+    _registry_version += 1
+    return enemy_class
+
+
+def spawn_weight(rule, level):
+    """Peso no nível dado, limitado ao máximo (ou mínimo, se decrescente)"""
+    base, step, limit = rule
+    weight = base + level * step
+    return max(limit, weight) if step < 0 else min(limit, weight)
+
+
+class SpawnTable:
+    """Pesos acumulados de sorteio por nível, calculados uma vez por nível.
+
+    overrides troca a regra de spawn_weight de tipos específicos (ver
+    GameConfig.ENEMY_SPAWN_WEIGHTS). Registrar um tipo novo invalida as
+    tabelas já calculadas.
+    """
+    def __init__(self, overrides=None):
+        self.overrides = overrides or {}
+        self.levels = {}
+        self.version = _registry_version
+
+    def get(self, level):
+        if self.version != _registry_version:
+            self.levels.clear()
+            self.version = _registry_version
+        table = self.levels.get(level)
+        if table is None:
+            names = list(ENEMY_TYPES)
+            weights = [spawn_weight(self.overrides.get(name, ENEMY_TYPES[name].spawn_weight), level)
+                       for name in names]
+            table = self.levels[level] = (names, list(itertools.accumulate(weights)))
+        return table
+
+    def choose(self, level, rng):
+        names, cumulative = self.get(level)
+        return rng.choices(names, cum_weights=cumulative)[0]
@@ -0,0 +1,252 @@
+import numpy as np
+import pygame
+from config import GameConfig
+from enemy_registry import ENEMY_TYPES
+
+# Tipos de inimigo (mesmas regras de entities/enemy.py)
+BASIC, ZIGZAG, HOMING, DIAGONAL = 0, 1, 2, 3
+KIND_IDS = {"basic": BASIC, "zigzag": ZIGZAG, "homing": HOMING, "diagonal": DIAGONAL}
+KIND_NAMES = {kind: name for name, kind in KIND_IDS.items()}
+KIND_COLORS = {
+    BASIC: (255, 50, 50),
+    ZIGZAG: (255, 150, 50),
+    HOMING: (255, 50, 150),
+    DIAGONAL: (50, 255, 100)
+}
+
+# Lados de spawn: top, bottom, left, right
+TOP, BOTTOM, LEFT, RIGHT = 0, 1, 2, 3
+DIR_X = np.array([0, 0, 1, -1], dtype=np.float64)
+DIR_Y = np.array([1, -1, 0, 0], dtype=np.float64)
+
+ENEMY_SIZE = 30
+
+FIELDS = ("x", "y", "previous_x", "previous_y", "speed", "side", "kind", "angle",
+          "oscillation_speed", "homing_strength", "diagonal_direction")
+
+
+def round_coord(values):
+    """Arredonda como pygame.Rect faz ao receber floats (metade para longe do zero)"""
+    return np.where(values >= 0, np.floor(values + 0.5), np.ceil(values - 0.5))
+
+
+class EnemyArrayStore:
+    """Inimigos em estrutura de arrays, atualizados em lote com NumPy.
+
+    Alternativa opcional à lista de objetos de entities/enemy.py para modos
+    de estresse com milhares de inimigos. As regras de movimento são as
+    mesmas, incluindo o arredondamento inteiro do pygame.Rect.
+    """
+    def __init__(self, width, height, capacity=16, seed=None, on_reset=None):
+        self.width = width
+        self.height = height
+        # Chamado com os índices que saíram da tela (desvios), antes do respawn
+        self.on_reset = on_reset
+        self.size = ENEMY_SIZE
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.previous_x = np.zeros(capacity)
+        self.previous_y = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.side = np.zeros(capacity, dtype=np.int8)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.angle = np.zeros(capacity)
+        self.oscillation_speed = np.zeros(capacity)
+        self.homing_strength = np.zeros(capacity)
+        self.diagonal_direction = np.zeros(capacity)
+
+    def grow(self):
+        old = {name: getattr(self, name) for name in FIELDS}
+        self.allocate(max(16, len(self.x) * 2))
+        for name in FIELDS:
+            getattr(self, name)[:self.count] = old[name][:self.count]
+
+    def __len__(self):
+        return self.count
+
+    def add(self, enemy_type):
+        """Adiciona um inimigo do tipo dado e devolve seu índice"""
+        kind = KIND_IDS.get(enemy_type)
+        if kind is None:
+            raise ValueError(f"Tipo de inimigo sem kernel vetorizado: {enemy_type}")
+        if self.count == len(self.x):
+            self.grow()
+        i = self.count
+        self.count += 1
+        self.kind[i] = kind
+        self.respawn(np.array([i]))
+        self.previous_x[i] = self.x[i]
+        self.previous_y[i] = self.y[i]
+        # O construtor de HomingEnemy usa força fixa; só o reset sorteia
+        if self.kind[i] == HOMING:
+            self.homing_strength[i] = 0.05
+        return i
+
+    def respawn(self, idx):
+        """Equivalente vetorizado de Enemy.reset para os índices dados"""
+        n = len(idx)
+        if n == 0:
+            return
+        side = self.rng.integers(0, 4, n)
+        along_x = self.rng.integers(0, self.width - self.size + 1, n)
+        along_y = self.rng.integers(0, self.height - self.size + 1, n)
+
+        self.side[idx] = side
+        self.x[idx] = np.select(
+            [side == LEFT, side == RIGHT], [-self.size, self.width], along_x)
+        self.y[idx] = np.select(
+            [side == TOP, side == BOTTOM], [-self.size, self.height], along_y)
+        self.speed[idx] = self.rng.integers(3, 7, n)
+
+        kind = self.kind[idx]
+        self.angle[idx] = 0
+        self.oscillation_speed[idx] = np.where(
+            kind == ZIGZAG, self.rng.uniform(0.05, 0.1, n), 0)
+        self.homing_strength[idx] = np.where(
+            kind == HOMING, self.rng.uniform(0.03, 0.07, n), 0)
+        self.diagonal_direction[idx] = np.where(
+            kind == DIAGONAL, self.rng.choice([-1.0, 1.0], n), 0)
+
+    def update(self, player_rect=None):
+        """Move todos os inimigos em um único passo vetorizado"""
+        n = self.count
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        self.previous_x[:n] = x
+        self.previous_y[:n] = y
+        speed = self.speed[:n]
+        side = self.side[:n]
+        kind = self.kind[:n]
+        vertical = side < LEFT
+
+        base_dx = DIR_X[side] * speed
+        base_dy = DIR_Y[side] * speed
+
+        # Componente diagonal
+        diagonal = kind == DIAGONAL
+        extra = self.diagonal_direction[:n] * 2
+        extra_x = np.where(diagonal & vertical, extra, 0)
+        extra_y = np.where(diagonal & ~vertical, extra, 0)
+
+        # Perseguição ao jogador
+        homing = kind == HOMING
+        if player_rect is not None and homing.any():
+            target_dx = player_rect.x - x
+            target_dy = player_rect.y - y
+            distance = np.maximum(1, np.sqrt(target_dx ** 2 + target_dy ** 2))
+            strength = speed * self.homing_strength[:n]
+            extra_x = np.where(homing, target_dx / distance * strength, extra_x)
+            extra_y = np.where(homing, target_dy / distance * strength, extra_y)
+
+        x[:] = round_coord(x + (base_dx + extra_x))
+        y[:] = round_coord(y + (base_dy + extra_y))
+
+        # Zigue-zague perpendicular à direção principal
+        zigzag = kind == ZIGZAG
+        if zigzag.any():
+            angle = self.angle[:n]
+            angle[zigzag] += self.oscillation_speed[:n][zigzag]
+            offset = np.sin(angle) * 3
+            x[:] = np.where(zigzag & vertical, round_coord(x + offset), x)
+            y[:] = np.where(zigzag & ~vertical, round_coord(y + offset), y)
+
+        dodged = np.flatnonzero(self.off_screen_mask())
+        if self.on_reset is not None and len(dodged):
+            self.on_reset(dodged)
+        self.respawn(dodged)
+
+    def off_screen_mask(self):
+        n = self.count
+        x, y, side = self.x[:n], self.y[:n], self.side[:n]
+        return (((side == TOP) & (y > self.height)) |
+                ((side == BOTTOM) & (y < -self.size)) |
+                ((side == LEFT) & (x > self.width)) |
+                ((side == RIGHT) & (x < -self.size)))
+
+    def increase_speed(self, config=GameConfig):
+        """Equivalente vetorizado de Game.increase_enemy_speed"""
+        n = self.count
+        kind = self.kind[:n]
+        self.speed[:n] += config.ENEMY_SPEED_STEP
+        self.oscillation_speed[:n][kind == ZIGZAG] += config.OSCILLATION_SPEED_STEP
+        homing = self.homing_strength[:n]
+        homing[kind == HOMING] = np.minimum(config.MAX_HOMING_STRENGTH,
+                                            homing[kind == HOMING] + config.HOMING_STRENGTH_STEP)
+
+    def clear(self):
+        """Remove todos os inimigos, mantendo os arrays alocados"""
+        self.count = 0
+
+    def reset(self, keep=None):
+        """Reposiciona todos os inimigos, mantendo apenas os `keep` primeiros"""
+        if keep is not None:
+            self.count = min(self.count, keep)
+        self.respawn(np.arange(self.count))
+
+    def find_collision(self, rect, buffer=0):
+        """Índice do primeiro inimigo que colide com rect, ou -1"""
+        n = self.count
+        if n == 0:
+            return -1
+        size = self.size + buffer * 2
+        if size <= 0 or rect.width <= 0 or rect.height <= 0:
+            return -1
+        ex = self.x[:n] - buffer
+        ey = self.y[:n] - buffer
+        hits = ((rect.x < ex + size) & (ex < rect.right) &
+                (rect.y < ey + size) & (ey < rect.bottom))
+        index = np.argmax(hits)
+        return int(index) if hits[index] else -1
+
+    def find_near(self, rect, margin):
+        """Índices dos inimigos a até margin pixels de rect"""
+        n = self.count
+        if n == 0:
+            return []
+        size = self.size + margin * 2
+        ex = self.x[:n] - margin
+        ey = self.y[:n] - margin
+        near = ((rect.x < ex + size) & (ex < rect.right) &
+                (rect.y < ey + size) & (ey < rect.bottom))
+        return np.flatnonzero(near).tolist()
+
+    def type_name(self, index):
+        return KIND_NAMES[int(self.kind[index])]
+
+    def positions(self, alpha=1.0):
+        """Posições inteiras, interpoladas entre o passo anterior e o atual"""
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        if alpha < 1.0:
+            previous_x, previous_y = self.previous_x[:n], self.previous_y[:n]
+            jumped = ((np.abs(x - previous_x) > GameConfig.MAX_INTERPOLATION_DISTANCE) |
+                      (np.abs(y - previous_y) > GameConfig.MAX_INTERPOLATION_DISTANCE))
+            x = np.where(jumped, x, round_coord(previous_x + (x - previous_x) * alpha))
+            y = np.where(jumped, y, round_coord(previous_y + (y - previous_y) * alpha))
+        return x.astype(np.int64).tolist(), y.astype(np.int64).tolist()
+
+    def rects(self, alpha=1.0):
+        """Retângulos de todos os inimigos"""
+        size = self.size
+        xs, ys = self.positions(alpha)
+        return [pygame.Rect(x, y, size, size) for x, y in zip(xs, ys)]
+
+    def draw(self, surface, sprite_cache, alpha=1.0, view=None):
+        """Desenha com um único Surface.blits os inimigos dentro de view (a câmera, em coordenadas do mundo)"""
+        size = (self.size, self.size)
+        sprites = [sprite_cache.get(ENEMY_TYPES[KIND_NAMES[kind]], KIND_COLORS[kind], size)
+                   for kind in range(len(KIND_IDS))]
+        xs, ys = self.positions(alpha)
+        if view is None:
+            view = pygame.Rect(0, 0, self.width, self.height)
+        left, top = view.x - self.size, view.y - self.size
+        right, bottom = view.right, view.bottom
+        surface.blits([(sprites[kind], (x - view.x, y - view.y))
+                       for x, y, kind in zip(xs, ys, self.kind[:self.count].tolist())
+                       if left < x < right and top < y < bottom], doreturn=False)
@@ -1,97 +1,136 @@
 import pygame, random
 import math
+from enemy_registry import register_enemy_type
 
+SPAWN_SIDES = ['top', 'bottom', 'left', 'right']
+# Direção do movimento para cada lado de spawn (sempre para o lado oposto)
+SIDE_DIRECTIONS = {
+    'top': (0, 1),
+    'bottom': (0, -1),
+    'left': (1, 0),
+    'right': (-1, 0)
+}
+
+@register_enemy_type
 class Enemy:
-    def __init__(self, width, height):
+    type_name = "basic"
+    # Peso de sorteio: (base, incremento por nível, limite)
+    spawn_weight = (1.0, -0.1, 0.5)
+    tracks_player = False
+    color = (255, 50, 50)
+    # Sem __dict__: inimigos ficam em um pool e são reaproveitados (ver enemy_pool.py)
+    __slots__ = ("rng", "width", "height", "rect", "speed", "spawn_side", "dx", "dy", "on_reset")
+
+    def __init__(self, width, height, rng=None, active=True):
+        # Gerador de números aleatórios (random.Random com seed ou o módulo random)
+        self.rng = rng or random
         self.width = width
         self.height = height
         self.rect = pygame.Rect(0, 0, 30, 30)
-        self.speed = random.randint(3, 6)
-        self.color = (255, 50, 50)
+        # Chamado com o inimigo quando ele sai da tela (desvio); definido pelo EnemyPool
+        self.on_reset = None
+        # Inimigos pré-alocados pelo pool só sorteiam o estado ao serem ativados
+        if active:
+            self.spawn()
+    
+    def spawn(self):
+        """Sorteia o estado inicial, consumindo o gerador na mesma ordem de sempre"""
+        self.speed = self.rng.randint(3, 6)
         self.spawn_side = None
         self.set_initial_position()
         
     def set_initial_position(self):
         # Escolhe um lado aleatório para spawnar
-        self.spawn_side = random.choice(['top', 'bottom', 'left', 'right'])
+        self.spawn_side = self.rng.choice(SPAWN_SIDES)
+        self.dx, self.dy = SIDE_DIRECTIONS[self.spawn_side]
         
         if self.spawn_side == 'top':
-            self.rect.x = random.randint(0, self.width - self.rect.width)
+            self.rect.x = self.rng.randint(0, self.width - self.rect.width)
             self.rect.y = -self.rect.height
         elif self.spawn_side == 'bottom':
-            self.rect.x = random.randint(0, self.width - self.rect.width)
+            self.rect.x = self.rng.randint(0, self.width - self.rect.width)
             self.rect.y = self.height
         elif self.spawn_side == 'left':
             self.rect.x = -self.rect.width
-            self.rect.y = random.randint(0, self.height - self.rect.height)
+            self.rect.y = self.rng.randint(0, self.height - self.rect.height)
         elif self.spawn_side == 'right':
             self.rect.x = self.width
-            self.rect.y = random.randint(0, self.height - self.rect.height)
+            self.rect.y = self.rng.randint(0, self.height - self.rect.height)
     
     def get_movement_direction(self):
-        # Define a direção do movimento baseado no lado de spawn
-        if self.spawn_side == 'top':
-            return 0, 1  # Move para baixo
-        elif self.spawn_side == 'bottom':
-            return 0, -1  # Move para cima
-        elif self.spawn_side == 'left':
-            return 1, 0  # Move para direita
-        elif self.spawn_side == 'right':
-            return -1, 0  # Move para esquerda
+        # Direção definida no spawn (ver SIDE_DIRECTIONS)
+        return self.dx, self.dy
     
     def is_off_screen(self):
         # Verifica se saiu completamente da tela pela borda oposta
-        if self.spawn_side == 'top' and self.rect.y > self.height:
-            return True
-        elif self.spawn_side == 'bottom' and self.rect.y < -self.rect.height:
-            return True
-        elif self.spawn_side == 'left' and self.rect.x > self.width:
-            return True
-        elif self.spawn_side == 'right' and self.rect.x < -self.rect.width:
-            return True
-        return False
-    
-    def update(self):
-        dx, dy = self.get_movement_direction()
-        self.rect.x += dx * self.speed
-        self.rect.y += dy * self.speed
+        if self.dy > 0:
+            return self.rect.y > self.height
+        if self.dy < 0:
+            return self.rect.y < -self.rect.height
+        if self.dx > 0:
+            return self.rect.x > self.width
+        return self.rect.x < -self.rect.width
+    
+    def update(self, steps=1):
+        # steps > 1: um único passo equivalente a `steps` passos (LOD da arena)
+        speed = self.speed * steps
+        self.rect.x += self.dx * speed
+        self.rect.y += self.dy * speed
         
         # Verifica se saiu da tela para resetar
         if self.is_off_screen():
             self.reset()
     
     def reset(self):
+        if self.on_reset is not None:
+            self.on_reset(self)
         self.set_initial_position()
-        self.speed = random.randint(3, 6)
+        self.speed = self.rng.randint(3, 6)
+    
+    def level_up(self, config):
+        """Aumento de dificuldade aplicado a cada nível"""
+        self.speed += config.ENEMY_SPEED_STEP
     
-    def draw(self, surface):
-        pygame.draw.rect(surface, self.color, self.rect)
+    @staticmethod
+    def bake_sprite(color, size):
+        """Aparência do tipo (pré-renderizada pelo SpriteCache); subclasses podem sobrescrever"""
+        sprite = pygame.Surface(size)
+        sprite.fill(color)
+        return sprite
 
 
+@register_enemy_type
 class ZigZagEnemy(Enemy):
-    def __init__(self, width, height):
-        super().__init__(width, height)
-        self.color = (255, 150, 50)  # Laranja
-        self.oscillation_speed = random.uniform(0.05, 0.1)
+    type_name = "zigzag"
+    spawn_weight = (0.1, 0.05, 0.3)
+    color = (255, 150, 50)  # Laranja
+    __slots__ = ("oscillation_speed", "angle", "original_spawn_side")
+
+    def spawn(self):
+        super().spawn()
+        self.oscillation_speed = self.rng.uniform(0.05, 0.1)
         self.angle = 0
         self.original_spawn_side = self.spawn_side
     
-    def update(self):
-        dx, dy = self.get_movement_direction()
-        
+    def update(self, steps=1):
+        speed = self.speed * steps
         # Movimento principal
-        self.rect.x += dx * self.speed
-        self.rect.y += dy * self.speed
+        self.rect.x += self.dx * speed
+        self.rect.y += self.dy * speed
         
         # Movimento de zigue-zague perpendicular à direção principal
-        self.angle += self.oscillation_speed
+        # (soma das oscilações dos `steps` passos)
+        offset = 0
+        for _ in range(steps):
+            self.angle += self.oscillation_speed
+            offset += math.sin(self.angle) * 3
         
-        if self.original_spawn_side in ['top', 'bottom']:
+        if self.dy:
             # Se veio de cima ou baixo, oscila horizontalmente
-            self.rect.x += math.sin(self.angle) * 3
+            self.rect.x += offset
         else:
             # Se veio dos lados, oscila verticalmente
-            self.rect.y += math.sin(self.angle) * 3
+            self.rect.y += offset
         
         # Verifica se saiu da tela para resetar
         if self.is_off_screen():
@@ -100,27 +139,39 @@ class ZigZagEnemy(Enemy):
     def reset(self):
         super().reset()
         self.original_spawn_side = self.spawn_side
-        self.oscillation_speed = random.uniform(0.05, 0.1)
+        self.oscillation_speed = self.rng.uniform(0.05, 0.1)
         self.angle = 0
+    
+    def level_up(self, config):
+        super().level_up(config)
+        self.oscillation_speed += config.OSCILLATION_SPEED_STEP
 
 
+@register_enemy_type
 class HomingEnemy(Enemy):
-    def __init__(self, width, height, player_rect=None):
-        super().__init__(width, height)
-        self.color = (255, 50, 150)  # Rosa
+    type_name = "homing"
+    spawn_weight = (0.05, 0.03, 0.2)
+    tracks_player = True
+    color = (255, 50, 150)  # Rosa
+    __slots__ = ("player_rect", "homing_strength", "original_spawn_side")
+
+    def __init__(self, width, height, player_rect=None, rng=None, active=True):
         self.player_rect = player_rect
+        super().__init__(width, height, rng, active)
+    
+    def spawn(self):
+        super().spawn()
         self.homing_strength = 0.05
         self.original_spawn_side = self.spawn_side
     
     def set_player_rect(self, player_rect):
         self.player_rect = player_rect
     
-    def update(self):
-        dx, dy = self.get_movement_direction()
-        
+    def update(self, steps=1):
+        speed = self.speed * steps
         # Movimento base na direção original
-        base_dx = dx * self.speed
-        base_dy = dy * self.speed
+        base_dx = self.dx * speed
+        base_dy = self.dy * speed
         
         # Movimento de perseguição ao jogador
         if self.player_rect:
@@ -134,8 +185,8 @@ class HomingEnemy(Enemy):
             target_dy /= distance
             
             # Combina movimento base com perseguição
-            final_dx = base_dx + target_dx * self.speed * self.homing_strength
-            final_dy = base_dy + target_dy * self.speed * self.homing_strength
+            final_dx = base_dx + target_dx * speed * self.homing_strength
+            final_dy = base_dy + target_dy * speed * self.homing_strength
         else:
             final_dx, final_dy = base_dx, base_dy
         
@@ -149,27 +200,37 @@ class HomingEnemy(Enemy):
     def reset(self):
         super().reset()
         self.original_spawn_side = self.spawn_side
-        self.homing_strength = random.uniform(0.03, 0.07)
+        self.homing_strength = self.rng.uniform(0.03, 0.07)
+    
+    def level_up(self, config):
+        super().level_up(config)
+        self.homing_strength = min(config.MAX_HOMING_STRENGTH,
+                                   self.homing_strength + config.HOMING_STRENGTH_STEP)
 
 
+@register_enemy_type
 class DiagonalEnemy(Enemy):
-    def __init__(self, width, height):
-        super().__init__(width, height)
-        self.color = (50, 255, 100)  # Verde
-        self.diagonal_direction = random.choice([-1, 1])
+    type_name = "diagonal"
+    spawn_weight = (0.08, 0.04, 0.25)
+    color = (50, 255, 100)  # Verde
+    __slots__ = ("diagonal_direction",)
+
+    def spawn(self):
+        super().spawn()
+        self.diagonal_direction = self.rng.choice([-1, 1])
     
-    def update(self):
-        dx, dy = self.get_movement_direction()
-        
+    def update(self, steps=1):
+        speed = self.speed * steps
+        drift = self.diagonal_direction * 2 * steps
         # Movimento diagonal baseado na direção original + componente diagonal
-        if self.spawn_side in ['top', 'bottom']:
+        if self.dy:
             # Se veio de cima/baixo, adiciona movimento horizontal
-            self.rect.x += dx * self.speed + self.diagonal_direction * 2
-            self.rect.y += dy * self.speed
+            self.rect.x += self.dx * speed + drift
+            self.rect.y += self.dy * speed
         else:
             # Se veio dos lados, adiciona movimento vertical
-            self.rect.x += dx * self.speed
-            self.rect.y += dy * self.speed + self.diagonal_direction * 2
+            self.rect.x += self.dx * speed
+            self.rect.y += self.dy * speed + drift
         
         # Verifica se saiu da tela para resetar
         if self.is_off_screen():
@@ -177,4 +238,4 @@ class DiagonalEnemy(Enemy):
     
     def reset(self):
         super().reset()
-        self.diagonal_direction = random.choice([-1, 1])
\ No newline at end of file
+        self.diagonal_direction = self.rng.choice([-1, 1])
\ No newline at end of file
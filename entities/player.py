@@ -8,8 +8,9 @@ class Player:
         self.screen_width = screen_width
         self.screen_height = screen_height
 
-    def handle_input(self):
-        keys = pygame.key.get_pressed()
+    def handle_input(self, keys=None):
+        if keys is None:
+            keys = pygame.key.get_pressed()
         
         # Movimento para esquerda
         if keys[pygame.K_LEFT]:
@@ -28,5 +29,9 @@ class Player:
         self.rect.x = max(0, min(self.rect.x, self.screen_width - self.rect.width))
         self.rect.y = max(0, min(self.rect.y, self.screen_height - self.rect.height))
 
-    def draw(self, surface):
-        pygame.draw.rect(surface, self.color, self.rect)
\ No newline at end of file
+    @staticmethod
+    def bake_sprite(color, size):
+        """Aparência do jogador (pré-renderizada pelo SpriteCache)"""
+        sprite = pygame.Surface(size)
+        sprite.fill(color)
+        return sprite
@@ -1,63 +1,211 @@
 import pygame
 import random
+import time
+from contextlib import nullcontext
 from config import GameConfig
 from game_state import GameState, GameStats
+from database import GameDatabase
+from persistence import SessionWriter
+from leaderboard_client import LeaderboardClient
 from entities.player import Player
-from entities.enemy import HomingEnemy
+from enemy_registry import ENEMY_TYPES, SpawnTable
+from enemy_pool import EnemyPool
 from enemy_factory import EnemyFactory
 from collision_system import CollisionSystem
 from particle_system import ParticleSystem
+from input_source import KeyboardInput, keys_to_mask
+from text_cache import NumberText
+from rng import RandomStreams
+from profiler import FrameProfiler
+from telemetry import Telemetry, DODGE, NEAR_MISS, LEVEL_UP, KILL
+from replay import ReplayRecorder, replay_path
+from dirty_renderer import DirtyRectRenderer
+from sprite_cache import SpriteCache
+from camera import Camera
+from scene_manager import open_window
+
+BACKGROUND_COLOR = (20, 20, 20)
+# Fontes do HUD e dos overlays: (nome, tamanho, negrito)
+HUD_FONT = ("arial", 24, False)
+BIG_FONT = ("arial", 36, True)
+ARENA_GRID_COLOR = (35, 35, 35)
 
 class Game:
-    def __init__(self):
-        pygame.init()
-        self.config = GameConfig()
-        self.stats = GameStats()
+    def __init__(self, input_source=None, config=None, seed=None, app=None):
+        self.config = config or GameConfig()
+        # SceneManager dono da janela, das fontes e do banco (None: o Game cria os seus)
+        self.app = app
+        self.input_source = input_source or KeyboardInput()
+        self.frame_count = 0
+        # Geradores com seed por subsistema: a sessão é reproduzível a partir dela
+        self.streams = RandomStreams(seed)
+        self.stats = self.create_stats()
+        self.stats.seed = self.streams.seed
         self.state = GameState.RUNNING
+        # Sessão gravada no game over (a mesma do bloco final do replay)
+        self.saved_session = None
+        self.setup_persistence()
+        self.setup_telemetry()
         
         self.setup_window()
         self.setup_entities()
         self.setup_systems()
+        self.setup_profiler()
+        self.start_replay()
         
     def setup_window(self):
-        self.window = pygame.display.set_mode(
-            (self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT)
-        )
-        pygame.display.set_caption("Square Dodger - Enhanced")
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.SysFont("arial", 24)
-        self.big_font = pygame.font.SysFont("arial", 36, bold=True)
+        if self.app is not None:
+            self.window = self.app.window
+            self.clock = self.app.clock
+            self.fonts = self.app.fonts
+            self.text_cache = self.app.text_cache
+        else:
+            self.window, self.clock, self.fonts, self.text_cache = open_window(self.config)
+        self.font = self.fonts.get(*HUD_FONT)
+        self.big_font = self.fonts.get(*BIG_FONT)
+        
+        # Textos e overlays estáticos do HUD
+        self.score_text = NumberText(self.text_cache, self.font, (255, 255, 255), "Score: ")
+        self.time_text = NumberText(self.text_cache, self.font, (200, 200, 255), "Time: ", "s")
+        self.overlays = {}
+        self.sprite_cache = SpriteCache()
+        self.dirty_renderer = DirtyRectRenderer(BACKGROUND_COLOR)
     
     def setup_entities(self):
+        # Limites do mundo: a janela, ou a arena quando WORLD_WIDTH/HEIGHT são maiores
+        self.world_width = self.config.WORLD_WIDTH or self.config.SCREEN_WIDTH
+        self.world_height = self.config.WORLD_HEIGHT or self.config.SCREEN_HEIGHT
+        self.arena = (self.world_width > self.config.SCREEN_WIDTH or
+                      self.world_height > self.config.SCREEN_HEIGHT)
+        self.camera = Camera(self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT,
+                             self.world_width, self.world_height)
         self.player = Player(
-            self.config.SCREEN_WIDTH // 2,
-            self.config.SCREEN_HEIGHT // 2,
-            self.config.SCREEN_WIDTH,
-            self.config.SCREEN_HEIGHT
+            self.world_width // 2,
+            self.world_height // 2,
+            self.world_width,
+            self.world_height
         )
-        self.enemies = self.create_initial_enemies()
+        self.enemy_store = None
+        self.enemy_pool = None
+        if self.config.ENEMY_ENGINE == "arrays":
+            self.enemies = []
+            self.enemy_store = self.create_enemy_store()
+        else:
+            self.enemy_pool = self.create_enemy_pool()
+            # Lista de inimigos ativos do pool (o mesmo objeto durante todo o jogo)
+            self.enemies = self.enemy_pool.active
+        self.spawn_initial_enemies()
     
     def setup_systems(self):
+        # Pesos acumulados de spawn por nível (tipos registrados + ENEMY_SPAWN_WEIGHTS)
+        self.spawn_table = SpawnTable(self.config.ENEMY_SPAWN_WEIGHTS)
         self.collision_system = CollisionSystem()
-        self.particle_system = ParticleSystem()
-        self.start_time = pygame.time.get_ticks()
+        self.particle_system = ParticleSystem(seed=self.streams.particles)
+        self.start_time = self.get_ticks()
+        self.previous_positions = None
     
-    def create_initial_enemies(self):
-        enemies = []
-        initial_enemies = [
-            ("basic", 2), ("zigzag", 1), ("homing", 1), ("diagonal", 1)
-        ]
+    def create_stats(self):
+        return GameStats(database=self.app.get_database() if self.app is not None else None)
+    
+    def setup_persistence(self):
+        # Sessões são gravadas em segundo plano para não travar o game over
+        self.session_writer = None
+        if self.stats.database is not None:
+            self.session_writer = SessionWriter(self.stats.database)
+            self.stats.writer = self.session_writer
+            if self.app is not None:
+                self.stats.remote = self.app.get_leaderboard_client()
+            elif self.config.LEADERBOARD_SERVER:
+                self.stats.remote = LeaderboardClient.from_address(
+                    self.config.LEADERBOARD_SERVER, self.config.LEADERBOARD_SPOOL,
+                    self.stats.database.get_setting("player_name"))
+    
+    def setup_telemetry(self):
+        # Eventos de jogo gravados em lote por outra thread (só com banco)
+        self.telemetry = None
+        self.near_enemies = {}
+        if self.stats.database is not None and self.config.TELEMETRY_ENABLED:
+            self.telemetry = Telemetry(self.stats.database, self.config.TELEMETRY_BUFFER_SIZE)
+            self.telemetry.start_session(self.streams.seed)
+    
+    def setup_profiler(self):
+        self.profiler = FrameProfiler() if self.config.PROFILER_ENABLED else None
+    
+    def profile(self, section):
+        """Mede o bloco na seção dada do profiler (não faz nada sem profiler)"""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.measure(section)
+    
+    def start_replay(self):
+        self.recorder = None
+        if self.config.RECORD_REPLAYS:
+            seed = self.streams.seed
+            self.recorder = ReplayRecorder(replay_path(self.config.REPLAY_DIR, seed), seed, self.config)
+    
+    def finish_replay(self, result=None):
+        if self.recorder is not None:
+            self.recorder.finish(result)
+            self.recorder = None
+    
+    def shutdown(self):
+        """Grava as sessões pendentes antes de sair"""
+        self.finish_replay()
+        if self.profiler is not None and self.config.PROFILE_EXPORT_PATH:
+            self.profiler.export(self.config.PROFILE_EXPORT_PATH)
+        if self.telemetry is not None:
+            self.telemetry.close()
+        if self.session_writer is not None:
+            self.session_writer.close()
+        # Com app, o cliente do leaderboard é do SceneManager e continua enviando em segundo plano
+        if self.stats.remote is not None and self.app is None:
+            self.stats.remote.close(self.config.LEADERBOARD_CLOSE_TIMEOUT)
+    
+    def get_ticks(self):
+        # Tempo de simulação: passos fixos, não o relógio real
+        return self.frame_count * 1000 // self.config.FPS
+    
+    INITIAL_ENEMIES = [
+        ("basic", 2), ("zigzag", 1), ("homing", 1), ("diagonal", 1)
+    ]
+    
+    def create_enemy_pool(self):
+        pool = EnemyPool(self.world_width, self.world_height, self.streams.enemies, self.record_dodge)
+        reserve = min(self.config.MAX_ENEMIES, self.config.ENEMY_POOL_RESERVE)
+        for enemy_type in ENEMY_TYPES:
+            pool.reserve(enemy_type, reserve)
+        return pool
+    
+    def create_enemy_store(self):
+        # Importado aqui para não carregar o módulo fora do modo "arrays" (o NumPy em si
+        # já é dependência do jogo: ParticleSystem e RandomStreams)
+        from enemy_store import EnemyArrayStore, KIND_IDS
         
-        for enemy_type, count in initial_enemies:
+        # Só os tipos com kernel vetorizado existem no motor "arrays"; um tipo
+        # registrado a mais mudaria o jogo em silêncio conforme o motor
+        unsupported = [name for name in ENEMY_TYPES if name not in KIND_IDS]
+        if unsupported:
+            raise ValueError(f"ENEMY_ENGINE 'arrays' não suporta os tipos: {', '.join(unsupported)}")
+        return EnemyArrayStore(self.world_width, self.world_height, seed=self.streams.enemy_store,
+                               on_reset=self.record_store_dodges)
+    
+    def spawn_initial_enemies(self):
+        for enemy_type, count in self.INITIAL_ENEMIES:
             for _ in range(count):
-                enemy = EnemyFactory.create_enemy(
-                    enemy_type,
-                    self.config.SCREEN_WIDTH,
-                    self.config.SCREEN_HEIGHT,
-                    self.player.rect if enemy_type == "homing" else None
-                )
-                enemies.append(enemy)
-        return enemies
+                if self.enemy_store is not None:
+                    self.enemy_store.add(enemy_type)
+                else:
+                    self.enemy_pool.acquire(enemy_type, self.player.rect)
+    
+    def enemy_count(self):
+        if self.enemy_store is not None:
+            return len(self.enemy_store)
+        return len(self.enemies)
+    
+    def enemy_rects(self):
+        if self.enemy_store is not None:
+            return self.enemy_store.rects()
+        return [enemy.rect for enemy in self.enemies]
     
     def handle_events(self):
         for event in pygame.event.get():
@@ -72,6 +220,8 @@ class Game:
                         return False  # Sair do jogo normalmente
                 if event.key == pygame.K_SPACE and self.state == GameState.GAME_OVER:
                     self.reset_game()
+                if event.key == pygame.K_F3 and self.profiler is not None:
+                    self.profiler.toggle_overlay()
                 if event.key == pygame.K_p and self.state == GameState.RUNNING:
                     self.state = GameState.PAUSED
                 elif event.key == pygame.K_p and self.state == GameState.PAUSED:
@@ -83,53 +233,144 @@ class Game:
         if self.state != GameState.RUNNING:
             return
         
+        self.frame_count += 1
+        
         # Atualizar entidades
-        self.player.handle_input()
+        keys = self.input_source.get_keys(self)
+        if self.recorder is not None:
+            self.recorder.record(keys_to_mask(keys))
+        self.player.handle_input(keys)
         
-        for enemy in self.enemies:
-            if isinstance(enemy, HomingEnemy):
-                enemy.set_player_rect(self.player.rect)
-            enemy.update()
+        if self.enemy_store is not None:
+            with self.profile("enemies.store"):
+                self.enemy_store.update(self.player.rect)
+        else:
+            self.update_enemies()
         
         # Verificar colisões
-        collided_enemy = self.collision_system.check_collisions(self.player, self.enemies, self.config.COLLISION_BUFFER)
-        if collided_enemy:
+        with self.profile("collisions"):
+            if self.enemy_store is not None:
+                index = self.enemy_store.find_collision(self.player.rect, self.config.COLLISION_BUFFER)
+                killer = self.enemy_store.type_name(index) if index >= 0 else None
+            else:
+                enemy = self.collision_system.check_collisions(self.player, self.enemies, self.config.COLLISION_BUFFER)
+                killer = enemy.type_name if enemy is not None else None
+        if killer is not None:
+            self.record_event(KILL, killer, self.stats.score)
             self.handle_game_over()
         
+        if self.telemetry is not None:
+            with self.profile("telemetry"):
+                self.record_near_misses()
+        
         # Atualizar sistemas
-        self.particle_system.update()
+        with self.profile("particles.update"):
+            self.particle_system.update()
         
         # Atualizar estatísticas
         self.stats.score += 1
-        self.stats.time_played = (pygame.time.get_ticks() - self.start_time) // 1000
+        self.stats.time_played = (self.get_ticks() - self.start_time) // 1000
         self.increase_difficulty()
     
+    def update_enemies(self):
+        profiler = self.profiler
+        # Com profiler: tempo por tipo de inimigo, um perf_counter por inimigo e
+        # um add() por tipo no fim do passo
+        type_times = None if profiler is None else {}
+        last = time.perf_counter() if profiler is not None else 0.0
+        # LOD da arena: inimigos longe do jogador avançam só a cada `interval` passos
+        interval = self.config.LOD_INTERVAL if self.arena else 1
+        far_sq = self.config.LOD_DISTANCE ** 2
+        px, py = self.player.rect.center
+        for index, enemy in enumerate(self.enemies):
+            if enemy.tracks_player:
+                enemy.set_player_rect(self.player.rect)
+            steps = 1
+            if interval > 1:
+                dx = enemy.rect.centerx - px
+                dy = enemy.rect.centery - py
+                if dx * dx + dy * dy > far_sq:
+                    # Escalonado pelo índice para distribuir a carga entre os passos
+                    if (index + self.frame_count) % interval:
+                        continue
+                    steps = interval
+            enemy.update(steps)
+            if type_times is not None:
+                now = time.perf_counter()
+                enemy_class = type(enemy)
+                type_times[enemy_class] = type_times.get(enemy_class, 0.0) + now - last
+                last = now
+        if type_times:
+            for enemy_class, seconds in type_times.items():
+                profiler.add(f"enemies.{enemy_class.__name__}", seconds)
+    
     def increase_difficulty(self):
         new_level = self.stats.score // self.config.LEVEL_UP_SCORE + 1
         
         if new_level > self.stats.level:
             self.stats.level = new_level
+            self.record_event(LEVEL_UP, value=new_level)
             self.add_new_enemy()
             self.increase_enemy_speed()
     
     def add_new_enemy(self):
-        if len(self.enemies) < self.config.MAX_ENEMIES:
-            enemy_type = EnemyFactory.get_random_enemy_type(self.stats.level)
-            new_enemy = EnemyFactory.create_enemy(
-                enemy_type,
-                self.config.SCREEN_WIDTH,
-                self.config.SCREEN_HEIGHT,
-                self.player.rect if enemy_type == "homing" else None
-            )
-            self.enemies.append(new_enemy)
+        if self.enemy_count() < self.config.MAX_ENEMIES:
+            enemy_type = EnemyFactory.get_random_enemy_type(
+                self.stats.level, self.streams.spawn, self.spawn_table)
+            if self.enemy_store is not None:
+                self.enemy_store.add(enemy_type)
+            else:
+                self.enemy_pool.acquire(enemy_type, self.player.rect)
     
     def increase_enemy_speed(self):
+        if self.enemy_store is not None:
+            self.enemy_store.increase_speed(self.config)
+            return
+        # Cada tipo define o próprio aumento de dificuldade (level_up)
         for enemy in self.enemies:
-            enemy.speed += 0.2
-            if hasattr(enemy, 'oscillation_speed'):
-                enemy.oscillation_speed += 0.005
-            if hasattr(enemy, 'homing_strength'):
-                enemy.homing_strength = min(0.1, enemy.homing_strength + 0.002)
+            enemy.level_up(self.config)
+    
+    def record_event(self, event, enemy_type=None, value=0.0):
+        if self.telemetry is not None:
+            self.telemetry.record(event, self.frame_count, enemy_type, value)
+    
+    def record_dodge(self, enemy):
+        """Chamado por Enemy.reset: o inimigo saiu da tela sem acertar o jogador"""
+        self.stats.enemies_dodged += 1
+        self.record_event(DODGE, enemy.type_name, enemy.speed)
+    
+    def record_store_dodges(self, indices):
+        """Equivalente de record_dodge para os inimigos do EnemyArrayStore"""
+        self.stats.enemies_dodged += len(indices)
+        if self.telemetry is None:
+            return
+        store = self.enemy_store
+        for index, speed in zip(indices.tolist(), store.speed[indices].tolist()):
+            self.record_event(DODGE, store.type_name(index), speed)
+    
+    def record_near_misses(self):
+        """Registra os inimigos que entraram na margem de quase-colisão e saíram dela sem colidir"""
+        margin = self.config.NEAR_MISS_MARGIN
+        if self.enemy_store is not None:
+            near = self.enemy_store.find_near(self.player.rect, margin)
+        else:
+            near = self.collision_system.find_near(self.player, self.enemies, margin)
+        previous = self.near_enemies
+        if not near and not previous:
+            return
+        # Chave: o inimigo (objects) ou seu índice (arrays); valor: (tipo, frame de entrada)
+        current = {}
+        for key in near:
+            entry = previous.get(key)
+            if entry is None:
+                type_name = key.type_name if self.enemy_store is None else self.enemy_store.type_name(key)
+                entry = (type_name, self.frame_count)
+            current[key] = entry
+        if self.state == GameState.RUNNING:
+            for key, (type_name, entered) in previous.items():
+                if key not in current:
+                    self.record_event(NEAR_MISS, type_name, self.frame_count - entered)
+        self.near_enemies = current
     
     def handle_game_over(self):
         self.state = GameState.GAME_OVER
@@ -137,7 +378,9 @@ class Game:
             self.stats.highscore = self.stats.score
     
     # SALVAR NO BANCO DE DADOS - NOVA LINHA ADICIONADA
-        self.stats.save_to_database()
+        self.saved_session = self.stats.save_to_database()
+        # O replay termina com os valores gravados, antes do score do passo ser somado em update
+        self.finish_replay(self.saved_session)
     
     # Adicionar efeito de partículas
         self.particle_system.add_explosion(
@@ -147,35 +390,105 @@ class Game:
             20
         )
     
-    def reset_game(self):
-        self.stats = GameStats()
+    def reset_game(self, seed=None):
+        # Nova seed por sessão; o estado inicial é o mesmo de um Game recém-criado
+        self.streams.reseed(seed)
+        self.stats.reset()
+        self.stats.seed = self.streams.seed
         self.state = GameState.RUNNING
-        self.start_time = pygame.time.get_ticks()
+        self.saved_session = None
+        # Contagem de passos por sessão (tempo de jogo, LOD, telemetria), como num Game novo
+        self.frame_count = 0
+        self.start_time = self.get_ticks()
+        self.previous_positions = None
+        self.near_enemies = {}
+        if self.telemetry is not None:
+            self.telemetry.start_session(self.streams.seed)
         
-        self.player.rect.center = (
-            self.config.SCREEN_WIDTH // 2,
-            self.config.SCREEN_HEIGHT // 2
+        self.player.rect.topleft = (
+            self.world_width // 2,
+            self.world_height // 2
         )
         
-        for enemy in self.enemies:
-            enemy.reset()
+        # Voltar para os inimigos iniciais, reaproveitando os já alocados
+        if self.enemy_store is not None:
+            self.enemy_store.clear()
+        else:
+            self.enemy_pool.release_all()
+        self.spawn_initial_enemies()
         
-        # Manter apenas os inimigos iniciais
-        self.enemies = self.enemies[:6] if len(self.enemies) > 6 else self.enemies
+        self.finish_replay()
+        self.start_replay()
+    
+    def snapshot_positions(self):
+        """Guarda as posições antes de um passo, para interpolar na renderização"""
+        self.previous_positions = [(self.player.rect.x, self.player.rect.y)]
+        self.previous_positions.extend((enemy.rect.x, enemy.rect.y) for enemy in self.enemies)
+    
+    def interpolated_rect(self, rect, index, alpha):
+        previous = self.previous_positions
+        if alpha >= 1.0 or previous is None or index >= len(previous):
+            return rect
+        previous_x, previous_y = previous[index]
+        # Saltos grandes (respawn, reset) não são interpolados
+        if (abs(rect.x - previous_x) > self.config.MAX_INTERPOLATION_DISTANCE or
+                abs(rect.y - previous_y) > self.config.MAX_INTERPOLATION_DISTANCE):
+            return rect
+        return pygame.Rect(round(previous_x + (rect.x - previous_x) * alpha),
+                           round(previous_y + (rect.y - previous_y) * alpha),
+                           rect.width, rect.height)
+    
+    def draw_entities(self, alpha):
+        """Desenha as entidades visíveis (sprites em cache, um único blits) e devolve seus retângulos na tela"""
+        get_sprite = self.sprite_cache.get_for
+        camera = self.camera
+        player_rect = self.interpolated_rect(self.player.rect, 0, alpha)
+        camera.follow(player_rect)
+        rects = [camera.to_screen(player_rect)]
+        blits = [(get_sprite(self.player), rects[0])]
+        for index, enemy in enumerate(self.enemies, 1):
+            rect = self.interpolated_rect(enemy.rect, index, alpha)
+            # Culling: só o que está dentro da câmera é desenhado
+            if camera.is_visible(rect):
+                rect = camera.to_screen(rect)
+                blits.append((get_sprite(enemy), rect))
+                rects.append(rect)
+        self.window.blits(blits, doreturn=False)
+        if self.enemy_store is not None:
+            self.enemy_store.draw(self.window, self.sprite_cache, alpha, camera.view)
+        return rects
     
-    def render(self):
-        self.window.fill((20, 20, 20))
+    def draw_arena_grid(self):
+        """Grade de fundo da arena, para o movimento da câmera ficar visível"""
+        size = self.config.ARENA_GRID_SIZE
+        offset_x, offset_y = self.camera.offset
+        width, height = self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT
+        for x in range(-(offset_x % size), width, size):
+            pygame.draw.line(self.window, ARENA_GRID_COLOR, (x, 0), (x, height))
+        for y in range(-(offset_y % size), height, size):
+            pygame.draw.line(self.window, ARENA_GRID_COLOR, (0, y), (width, y))
+    
+    def render(self, alpha=1.0):
+        # Na arena a grade rola com a câmera e a tela inteira muda: sempre renderização completa
+        if self.config.RENDER_MODE == "dirty" and self.state == GameState.RUNNING and not self.arena:
+            self.render_dirty(alpha)
+            return
+        
+        self.window.fill(BACKGROUND_COLOR)
         
         # Renderizar entidades
-        self.player.draw(self.window)
-        for enemy in self.enemies:
-            enemy.draw(self.window)
+        if self.arena:
+            self.camera.follow(self.interpolated_rect(self.player.rect, 0, alpha))
+            self.draw_arena_grid()
+        self.draw_entities(alpha)
         
         # Renderizar sistemas
-        self.particle_system.draw(self.window)
+        with self.profile("particles.draw"):
+            self.particle_system.draw(self.window, self.camera.offset)
         
         # Renderizar UI
-        self.render_ui()
+        with self.profile("render_ui"):
+            self.render_ui()
         
         # Renderizar tela de game over
         if self.state == GameState.GAME_OVER:
@@ -185,61 +498,138 @@ class Game:
         if self.state == GameState.PAUSED:
             self.render_pause_screen()
         
-        pygame.display.flip()
+        if self.profiler is not None:
+            self.profiler.draw_overlay(self.window, self.text_cache, self.fonts)
+        
+        with self.profile("display.flip"):
+            pygame.display.flip()
+        # Overlays cobrem a tela toda; o próximo frame "dirty" redesenha tudo
+        self.dirty_renderer.invalidate()
+    
+    def render_dirty(self, alpha=1.0):
+        self.dirty_renderer.erase(self.window)
+        
+        rects = [rect.copy() for rect in self.draw_entities(alpha)]
+        if self.enemy_store is not None:
+            rects.extend(self.enemy_store.rects(alpha))
+        
+        particle_bounds = self.particle_system.get_bounds()
+        if particle_bounds is not None:
+            rects.append(particle_bounds)
+        with self.profile("particles.draw"):
+            self.particle_system.draw(self.window)
+        
+        with self.profile("render_ui"):
+            rects.append(self.render_ui())
+        if self.profiler is not None:
+            overlay_rect = self.profiler.draw_overlay(self.window, self.text_cache, self.fonts)
+            if overlay_rect is not None:
+                rects.append(overlay_rect)
+        with self.profile("display.flip"):
+            self.dirty_renderer.present(rects)
     
     def render_ui(self):
-        # Score e Highscore
-        score_text = self.font.render(f"Score: {self.stats.score}", True, (255, 255, 255))
-        highscore_text = self.font.render(f"Highscore: {self.stats.highscore}", True, (200, 200, 200))
-        level_text = self.font.render(f"Level: {self.stats.level}", True, (200, 255, 200))
-        time_text = self.font.render(f"Time: {self.stats.time_played}s", True, (200, 200, 255))
+        # Score e tempo mudam sempre: desenhados glifo a glifo
+        score_rect = self.score_text.draw(self.window, self.stats.score, (10, 10))
         
-        self.window.blit(score_text, (10, 10))
-        self.window.blit(highscore_text, (10, 40))
-        self.window.blit(level_text, (10, 70))
-        self.window.blit(time_text, (10, 100))
+        highscore_text = self.text_cache.render(self.font, f"Highscore: {self.stats.highscore}", (200, 200, 200))
+        level_text = self.text_cache.render(self.font, f"Level: {self.stats.level}", (200, 255, 200))
+        
+        hud_rects = [
+            self.window.blit(highscore_text, (10, 40)),
+            self.window.blit(level_text, (10, 70)),
+            self.time_text.draw(self.window, self.stats.time_played, (10, 100))
+        ]
         
         # Inimigos restantes
-        enemies_text = self.font.render(f"Enemies: {len(self.enemies)}", True, (255, 200, 200))
-        self.window.blit(enemies_text, (10, 130))
+        enemies_text = self.text_cache.render(self.font, f"Enemies: {self.enemy_count()}", (255, 200, 200))
+        hud_rects.append(self.window.blit(enemies_text, (10, 130)))
+        
+        # Região ocupada pelo HUD (usada pelo renderizador "dirty")
+        return score_rect.unionall(hud_rects)
     
-    def render_game_over(self):
+    def build_overlay(self, alpha, texts):
+        """Overlay de tela cheia com o escurecimento e os textos fixos já aplicados"""
         overlay = pygame.Surface((self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        self.window.blit(overlay, (0, 0))
+        overlay.fill((0, 0, 0, alpha))
+        for text_surf, center in texts:
+            overlay.blit(text_surf, text_surf.get_rect(center=center))
+        return overlay
     
-        game_over_text = self.big_font.render("GAME OVER", True, (255, 50, 50))
-        score_text = self.font.render(f"Final Score: {self.stats.score}", True, (255, 255, 255))
-        restart_text = self.font.render("Press SPACE to restart or ESC to return to menu", True, (200, 200, 200))
+    def get_overlay(self, state):
+        overlay = self.overlays.get(state)
+        if overlay is not None:
+            return overlay
+        
+        center_x = self.config.SCREEN_WIDTH // 2
+        center_y = self.config.SCREEN_HEIGHT // 2
+        if state == GameState.GAME_OVER:
+            overlay = self.build_overlay(180, [
+                (self.big_font.render("GAME OVER", True, (255, 50, 50)), (center_x, center_y - 50)),
+                (self.font.render("Press SPACE to restart or ESC to return to menu", True, (200, 200, 200)), (center_x, center_y + 50))
+            ])
+        else:
+            overlay = self.build_overlay(150, [
+                (self.big_font.render("PAUSED", True, (255, 255, 255)), (center_x, center_y - 20)),
+                (self.font.render("Press P to continue", True, (200, 200, 200)), (center_x, center_y + 20))
+            ])
+        self.overlays[state] = overlay
+        return overlay
     
-        self.window.blit(game_over_text, game_over_text.get_rect(center=(self.config.SCREEN_WIDTH//2, self.config.SCREEN_HEIGHT//2 - 50)))
+    def render_game_over(self):
+        self.window.blit(self.get_overlay(GameState.GAME_OVER), (0, 0))
+    
+        score_text = self.text_cache.render(self.font, f"Final Score: {self.stats.score}", (255, 255, 255))
         self.window.blit(score_text, score_text.get_rect(center=(self.config.SCREEN_WIDTH//2, self.config.SCREEN_HEIGHT//2)))
-        self.window.blit(restart_text, restart_text.get_rect(center=(self.config.SCREEN_WIDTH//2, self.config.SCREEN_HEIGHT//2 + 50)))
     
     def render_pause_screen(self):
-        overlay = pygame.Surface((self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        self.window.blit(overlay, (0, 0))
-        
-        pause_text = self.big_font.render("PAUSED", True, (255, 255, 255))
-        continue_text = self.font.render("Press P to continue", True, (200, 200, 200))
-        
-        self.window.blit(pause_text, pause_text.get_rect(center=(self.config.SCREEN_WIDTH//2, self.config.SCREEN_HEIGHT//2 - 20)))
-        self.window.blit(continue_text, continue_text.get_rect(center=(self.config.SCREEN_WIDTH//2, self.config.SCREEN_HEIGHT//2 + 20)))
+        self.window.blit(self.get_overlay(GameState.PAUSED), (0, 0))
     
     def run(self):
+        # Simulação em passos fixos de 1/FPS s; a renderização interpola entre passos
+        step = 1.0 / self.config.FPS
+        accumulator = 0.0
+        previous_time = time.perf_counter()
         running = True
-        while running:
-            result = self.handle_events()
-        
-            if result == "MENU":
-                return "MENU"  # Sinal para voltar ao menu
-            elif result is False:
-                break
+        # A janela pode ter sido usada por outra cena: o primeiro frame é completo
+        self.dirty_renderer.invalidate()
+        try:
+            while running:
+                frame_start = time.perf_counter()
+                with self.profile("handle_events"):
+                    result = self.handle_events()
             
-            self.update()
-            self.render()
-            self.clock.tick(self.config.FPS)
+                if result == "MENU":
+                    return "MENU"  # Sinal para voltar ao menu
+                elif result is False:
+                    break
+                
+                now = time.perf_counter()
+                accumulator += now - previous_time
+                previous_time = now
+                
+                # Em máquinas lentas roda vários passos por frame para não perder velocidade
+                steps = 0
+                with self.profile("update"):
+                    while accumulator >= step and steps < self.config.MAX_STEPS_PER_FRAME:
+                        self.snapshot_positions()
+                        self.update()
+                        accumulator -= step
+                        steps += 1
+                if accumulator >= step:
+                    # Atraso grande demais para recuperar: descarta o excesso
+                    accumulator %= step
+                
+                with self.profile("render"):
+                    self.render(accumulator / step)
+                self.clock.tick(self.config.MAX_RENDER_FPS)
+                if self.profiler is not None:
+                    self.profiler.end_frame(time.perf_counter() - frame_start)
+        finally:
+            self.shutdown()
     
-        pygame.quit()
+        # Com SceneManager, janela e banco continuam abertos para as outras cenas
+        if self.app is None:
+            GameDatabase.close_all()
+            pygame.quit()
         return "EXIT"
\ No newline at end of file
@@ -1,5 +1,5 @@
 from enum import Enum
-from database import GameDatabase
+from database import GameDatabase, current_session_date
 
 class GameState(Enum):
     RUNNING = 1
@@ -7,28 +7,58 @@ class GameState(Enum):
     PAUSED = 3
 
 class GameStats:
-    def __init__(self):
-        self.score = 0
+    def __init__(self, persist=True, database=None):
         self.highscore = 0
-        self.level = 1
-        self.enemies_dodged = 0
-        self.time_played = 0
-        self.database = GameDatabase()
+        self.seed = None
+        self.reset()
+        # Sessões headless não tocam no banco de dados
+        self.database = (database or GameDatabase()) if persist else None
+        # SessionWriter opcional: com ele o save não bloqueia o frame
+        self.writer = None
+        # LeaderboardClient opcional: envia também ao leaderboard compartilhado
+        self.remote = None
         
         # Carregar highscore do banco de dados
         self.load_highscore()
     
+    def reset(self):
+        """Zera a sessão atual, mantendo highscore e conexão com o banco"""
+        self.score = 0
+        self.level = 1
+        self.enemies_dodged = 0
+        self.time_played = 0
+    
     def load_highscore(self):
         """Carrega o highscore do banco de dados"""
-        high_scores = self.database.get_high_scores(1)
-        if high_scores:
-            self.highscore = high_scores[0][1]  # Score do primeiro lugar
+        if self.database is None:
+            return
+        top_score = self.database.get_top_score()
+        if top_score is not None:
+            self.highscore = top_score
+    
+    def get_session(self):
+        """Sessão atual com os campos de GameDatabase.save_game_session"""
+        return {
+            "score": self.score,
+            "level": self.level,
+            "time_played": self.time_played,
+            "enemies_dodged": self.enemies_dodged,
+            "session_date": current_session_date(),
+            "seed": self.seed
+        }
     
     def save_to_database(self):
-        """Salva a sessão atual no banco de dados"""
-        self.database.save_game_session(
-            score=self.score,
-            level=self.level,
-            time_played=self.time_played,
-            enemies_dodged=self.enemies_dodged
-        )
\ No newline at end of file
+        """Salva a sessão atual no banco de dados (e no leaderboard compartilhado, se houver).
+        
+        Devolve a sessão com os valores gravados (mesmo sem banco).
+        """
+        session = self.get_session()
+        if self.remote is not None:
+            self.remote.submit(**session)
+        if self.database is None:
+            return session
+        if self.writer is not None:
+            self.writer.submit(**session)
+        else:
+            self.database.save_game_session(**session)
+        return session
\ No newline at end of file
@@ -0,0 +1,102 @@
+import argparse
+import time
+from config import GameConfig
+from game import Game
+from game_state import GameState, GameStats
+from input_source import ScriptedInput
+
+
+class HeadlessGame(Game):
+    """Game sem janela, sem relógio e sem teclado.
+
+    Avança Game.update o mais rápido que a CPU permitir, com entrada
+    vinda de um input_source (ScriptedInput, PolicyInput...). Como no
+    Game, o tempo de jogo é contado em passos simulados.
+    """
+    def __init__(self, input_source=None, config=None, seed=None):
+        super().__init__(input_source or ScriptedInput([]), config, seed)
+
+    def setup_window(self):
+        self.window = None
+        self.clock = None
+        self.fonts = None
+        self.font = None
+        self.big_font = None
+
+    def setup_profiler(self):
+        # Sem profiler por padrão; benchmarks podem atribuir um FrameProfiler
+        self.profiler = None
+
+    def start_replay(self):
+        # Sessões em lote não gravam replay
+        self.recorder = None
+
+    def create_stats(self):
+        return GameStats(persist=False)
+
+    def render(self, alpha=1.0):
+        pass
+
+    def run(self, max_frames=None):
+        """Simula até o game over (ou max_frames) e devolve o resultado"""
+        while self.state == GameState.RUNNING:
+            if max_frames is not None and self.frame_count >= max_frames:
+                break
+            if self.profiler is None:
+                self.update()
+                continue
+            start = time.perf_counter()
+            self.update()
+            self.profiler.end_frame(time.perf_counter() - start)
+        return self.get_result()
+
+    def get_result(self):
+        return {
+            "score": self.stats.score,
+            "level": self.stats.level,
+            "time_played": self.stats.time_played,
+            "enemies_dodged": self.stats.enemies_dodged,
+            "frames": self.frame_count,
+            "seed": self.streams.seed,
+            "game_over": self.state == GameState.GAME_OVER
+        }
+
+
+def run_session(input_source=None, max_frames=None, config=None, seed=None):
+    """Executa uma sessão headless completa"""
+    return HeadlessGame(input_source, config, seed).run(max_frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Square Dodger headless")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument("--engine", choices=["objects", "arrays"], default="objects")
+    parser.add_argument("--max-enemies", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed da primeira sessão (as seguintes usam seed+1, seed+2...)")
+    args = parser.parse_args()
+
+    config = GameConfig()
+    config.ENEMY_ENGINE = args.engine
+    if args.max_enemies is not None:
+        config.MAX_ENEMIES = args.max_enemies
+
+    start = time.perf_counter()
+    total_frames = 0
+    scores = []
+    for i in range(args.sessions):
+        seed = None if args.seed is None else args.seed + i
+        result = run_session(max_frames=args.max_frames, config=config, seed=seed)
+        total_frames += result["frames"]
+        scores.append(result["score"])
+    elapsed = time.perf_counter() - start
+
+    print(f"Sessões: {args.sessions}")
+    print(f"Score médio: {sum(scores) / len(scores):.1f}")
+    print(f"Melhor score: {max(scores)}")
+    print(f"Frames simulados: {total_frames} ({total_frames / elapsed:.0f} frames/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import pygame
+
+# Bits da máscara de entrada (as quatro setas lidas por Player.handle_input)
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_UP = 4
+INPUT_DOWN = 8
+
+KEY_BITS = {
+    pygame.K_LEFT: INPUT_LEFT,
+    pygame.K_RIGHT: INPUT_RIGHT,
+    pygame.K_UP: INPUT_UP,
+    pygame.K_DOWN: INPUT_DOWN
+}
+
+
+def keys_to_mask(keys):
+    """Converte um estado de teclas indexável em máscara de bits"""
+    mask = 0
+    for key, bit in KEY_BITS.items():
+        if keys[key]:
+            mask |= bit
+    return mask
+
+
+class KeyState:
+    """Estado de teclas indexável como pygame.key.get_pressed()"""
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        return bool(self.mask & KEY_BITS.get(key, 0))
+
+
+class KeyboardInput:
+    """Entrada real do teclado"""
+    def get_keys(self, game):
+        return pygame.key.get_pressed()
+
+
+class ScriptedInput:
+    """Entrada a partir de uma sequência de máscaras, uma por frame"""
+    def __init__(self, masks, loop=False):
+        self.masks = list(masks)
+        self.loop = loop
+        self.index = 0
+
+    def get_keys(self, game):
+        if not self.masks:
+            return KeyState(0)
+        if self.index >= len(self.masks):
+            if not self.loop:
+                return KeyState(0)
+            self.index = 0
+        mask = self.masks[self.index]
+        self.index += 1
+        return KeyState(mask)
+
+
+class PolicyInput:
+    """Entrada programática: policy(game) devolve a máscara do frame"""
+    def __init__(self, policy):
+        self.policy = policy
+
+    def get_keys(self, game):
+        return KeyState(self.policy(game))
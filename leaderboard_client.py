@@ -0,0 +1,176 @@
+import json
+import os
+import socket
+import threading
+import uuid
+from background_writer import BackgroundWriter
+
+
+class LeaderboardError(Exception):
+    """O servidor recusou a requisição (não adianta tentar de novo)"""
+
+
+class LeaderboardClient(BackgroundWriter):
+    """Envia sessões ao servidor de leaderboard em segundo plano.
+
+    Como SessionWriter, é um BackgroundWriter (submit/flush/close), então
+    pode ser usado como GameStats.remote. Cada sessão ganha um id, e o servidor
+    ignora reenvios. A thread junta as sessões da fila em um único submit e
+    reaproveita a mesma conexão TCP. Falhas de rede são repetidas com
+    espera crescente. Se todas falham, as sessões vão para o spool (JSON
+    Lines) e são reenviadas quando o servidor voltar a responder.
+    close(timeout) não espera o servidor além do timeout: o que não foi
+    enviado fica no spool.
+    """
+    thread_name = "LeaderboardClient"
+
+    def __init__(self, host, port, spool_path=None, player_name=None, retries=3, backoff=0.2, timeout=2.0,
+                 batch_size=64):
+        super().__init__(batch_size, 0.0, retries, backoff)
+        self.address = (host, port)
+        # Nome enviado nas sessões sem player_name (None: o padrão do servidor)
+        self.player_name = player_name
+        self.spool_path = spool_path
+        self.timeout = timeout
+        # Uma requisição por vez na conexão compartilhada
+        self.lock = threading.Lock()
+        self.sock = None
+        self.stream = None
+        self.spool_lock = threading.Lock()
+
+        # Métricas
+        self.sessions_sent = 0
+        self.sessions_spooled = 0
+
+    @classmethod
+    def from_address(cls, address, spool_path=None, player_name=None):
+        """Cria o cliente a partir de 'host:porta' (ver GameConfig.LEADERBOARD_SERVER)"""
+        host, _, port = address.rpartition(":")
+        return cls(host or "127.0.0.1", int(port), spool_path, player_name)
+
+    def connect(self):
+        if self.sock is None:
+            self.sock = socket.create_connection(self.address, self.timeout)
+            self.stream = self.sock.makefile("rb")
+        return self.sock
+
+    def disconnect(self):
+        if self.sock is not None:
+            self.stream.close()
+            self.sock.close()
+        self.sock = None
+        self.stream = None
+
+    def request(self, payload):
+        """Envia uma requisição e devolve a resposta; reconecta se a conexão caiu"""
+        with self.lock:
+            try:
+                self.connect().sendall(json.dumps(payload).encode() + b"\n")
+                line = self.stream.readline()
+                if not line:
+                    raise ConnectionError("Conexão fechada pelo servidor")
+                response = json.loads(line)
+            except (OSError, ValueError):
+                self.disconnect()
+                raise
+        if not response.get("ok"):
+            if response.get("retry"):
+                raise ConnectionError(response.get("error"))
+            raise LeaderboardError(response.get("error"))
+        return response
+
+    def request_with_retry(self, payload):
+        return self.call_with_retry((OSError, ValueError), self.request, payload)
+
+    def get_high_scores(self, limit=10):
+        """Top-N do leaderboard compartilhado (mesmo formato de GameDatabase.get_high_scores)"""
+        return [tuple(row) for row in self.request_with_retry({"op": "top", "limit": limit})["scores"]]
+
+    def get_player_stats(self, player_name):
+        stats = self.request_with_retry({"op": "player", "name": player_name})["stats"]
+        return tuple(stats)
+
+    def submit(self, **session):
+        """Enfileira uma sessão (mesmos argumentos de GameDatabase.save_game_session)"""
+        session.setdefault("id", uuid.uuid4().hex)
+        if session.get("player_name") is None:
+            session["player_name"] = self.player_name
+        super().submit(**session)
+
+    def write_batch(self, batch):
+        """Envia o spool pendente e o lote; se o servidor não responde, o lote vai para o spool"""
+        try:
+            self.send_spool()
+            self.request_with_retry({"op": "submit", "sessions": batch})
+        except LeaderboardError as e:
+            self.errors += 1
+            print(f"Sessões recusadas pelo leaderboard: {e}")
+            return
+        except (OSError, ValueError):
+            self.errors += 1
+            # Se close() desistiu de esperar, o lote já foi para o spool
+            if self.in_flight is batch:
+                self.write_spool(batch)
+            return
+        self.sessions_sent += len(batch)
+
+    def write_spool(self, sessions):
+        if self.spool_path is None or not sessions:
+            return
+        with self.spool_lock:
+            with open(self.spool_path, "a") as spool:
+                for session in sessions:
+                    spool.write(json.dumps(session) + "\n")
+            self.sessions_spooled += len(sessions)
+
+    def send_spool(self):
+        """Reenvia as sessões do spool em lotes e o apaga (reenvios são ignorados pelo servidor)"""
+        if self.spool_path is None or not os.path.exists(self.spool_path):
+            return
+        with self.spool_lock:
+            with open(self.spool_path) as spool:
+                lines = spool.read()
+        sessions = [json.loads(line) for line in lines.splitlines() if line.strip()]
+        for i in range(0, len(sessions), self.batch_size):
+            batch = sessions[i:i + self.batch_size]
+            try:
+                self.request_with_retry({"op": "submit", "sessions": batch})
+            except LeaderboardError as e:
+                self.errors += 1
+                print(f"Sessões do spool recusadas pelo leaderboard: {e}")
+                continue
+            self.sessions_sent += len(batch)
+        # Mantém o que foi escrito no spool durante o envio
+        with self.spool_lock:
+            with open(self.spool_path) as spool:
+                rest = spool.read()[len(lines):]
+            if rest:
+                with open(self.spool_path, "w") as spool:
+                    spool.write(rest)
+            else:
+                os.remove(self.spool_path)
+
+    def close(self, timeout=None):
+        """Envia o que estiver pendente, encerra a thread e fecha a conexão.
+
+        Com timeout, espera no máximo timeout segundos; se o servidor não
+        respondeu até lá, as sessões não enviadas vão para o spool e a
+        thread termina sozinha (sem novas tentativas). Se a thread ainda
+        conseguir enviar o lote em andamento, o servidor ignora a cópia do spool.
+        """
+        # Sem novas tentativas nem espera entre elas
+        self.closing = True
+        if not super().close(timeout):
+            self.write_spool(self.take_pending())
+            return
+        self.closing = False
+        with self.lock:
+            self.disconnect()
+
+    def get_metrics(self):
+        metrics = super().get_metrics()
+        metrics.update({
+            "sessions_sent": self.sessions_sent,
+            "sessions_spooled": self.sessions_spooled
+        })
+        return metrics
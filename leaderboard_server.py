@@ -0,0 +1,290 @@
+import argparse
+import asyncio
+import bisect
+import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from database import GameDatabase, LEADERBOARD_SIZE, current_session_date
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Ids de sessões já gravadas lembrados para ignorar reenvios dos clientes
+RECENT_IDS = 100000
+SESSION_FIELDS = ("score", "level", "time_played", "enemies_dodged")
+
+
+class LeaderboardCache:
+    """Top-N e agregados por jogador em memória, atualizados a cada lote gravado.
+
+    Os jogadores entram no cache na primeira consulta (lidos do banco); os
+    que não estão nele são ignorados por add_session, pois a leitura
+    posterior já inclui a sessão gravada.
+    """
+    def __init__(self, size=LEADERBOARD_SIZE):
+        self.size = size
+        # (-score, ordem de chegada, linha): mesma ordem de LEADERBOARD_SQL
+        self.top = []
+        self.order = 0
+        # nome -> [jogos, melhor score, score total, maior nível, tempo total]
+        self.players = {}
+
+    def add_top(self, row):
+        entry = (-row[1], self.order, row)
+        self.order += 1
+        if len(self.top) >= self.size and entry > self.top[-1]:
+            return
+        bisect.insort(self.top, entry)
+        del self.top[self.size:]
+
+    def high_scores(self, limit):
+        return [row for _, _, row in self.top[:limit]]
+
+    def set_player(self, player_name, stats):
+        """Guarda o resultado de GameDatabase.get_player_stats"""
+        games, best, average, highest, total_time = stats
+        self.players.setdefault(player_name, [
+            games, best or 0, round((average or 0) * games), highest or 0, total_time or 0])
+
+    def player_stats(self, player_name):
+        """Mesmo formato de GameDatabase.get_player_stats, ou None se o jogador não está no cache"""
+        stats = self.players.get(player_name)
+        if stats is None:
+            return None
+        games, best, total, highest, total_time = stats
+        if games == 0:
+            return (0, None, None, None, None)
+        return (games, best, total / games, highest, total_time)
+
+    def add_session(self, session):
+        player_name = session["player_name"]
+        self.add_top((player_name, session["score"], session["level"],
+                      session["time_played"], session["session_date"]))
+        stats = self.players.get(player_name)
+        if stats is not None:
+            stats[0] += 1
+            stats[1] = max(stats[1], session["score"])
+            stats[2] += session["score"]
+            stats[3] = max(stats[3], session["level"])
+            stats[4] += session["time_played"]
+
+
+class LeaderboardServer:
+    """Servidor asyncio que recebe sessões de vários jogos e mantém o leaderboard.
+
+    Protocolo: uma requisição JSON por linha, uma resposta JSON por linha,
+    várias requisições por conexão:
+      {"op": "submit", "sessions": [...]}   (campos de save_game_session + "id")
+      {"op": "top", "limit": 10}
+      {"op": "player", "name": "Player"}
+    As sessões recebidas de todas as conexões entram em uma fila e são
+    gravadas juntas, em uma transação por lote (até batch_size sessões ou
+    flush_interval segundos); o submit só é respondido depois do commit.
+    Leituras saem do LeaderboardCache. Todo acesso ao banco passa por uma
+    única thread, então leituras e gravações chegam ao cache em ordem.
+    """
+    def __init__(self, database, batch_size=256, flush_interval=0.05):
+        self.database = database
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix="LeaderboardDB")
+        self.cache = LeaderboardCache()
+        self.queue = None
+        self.writer_task = None
+        self.server = None
+        self.connections = set()
+        self.default_name = None
+        # id -> futuro da gravação (pendentes) e ids já gravados
+        self.pending = {}
+        self.recent_ids = OrderedDict()
+
+        # Métricas
+        self.sessions_written = 0
+        self.batches_written = 0
+        self.duplicates = 0
+        self.errors = 0
+
+    async def run_db(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.queue = asyncio.Queue()
+        self.default_name = await self.run_db(self.database.get_setting, "player_name")
+        for row in await self.run_db(self.database.get_high_scores, LEADERBOARD_SIZE):
+            self.cache.add_top(tuple(row))
+        self.writer_task = asyncio.create_task(self.write_batches())
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server
+
+    async def close(self):
+        """Para de aceitar conexões, grava o que estiver na fila e encerra"""
+        if self.server is not None:
+            self.server.close()
+            # Conexões abertas mantêm wait_closed esperando
+            for writer in list(self.connections):
+                writer.close()
+            await self.server.wait_closed()
+        if self.writer_task is not None:
+            await self.queue.join()
+            self.writer_task.cancel()
+        self.executor.shutdown()
+
+    async def handle_client(self, reader, writer):
+        self.connections.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = await self.dispatch(json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    response = {"ok": False, "error": str(e)}
+                except Exception as e:
+                    # Falha do banco: o cliente pode tentar de novo
+                    response = {"ok": False, "error": str(e), "retry": True}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections.discard(writer)
+            writer.close()
+
+    async def dispatch(self, request):
+        op = request["op"]
+        if op == "submit":
+            sessions = [self.validate(session) for session in request["sessions"]]
+            await asyncio.gather(*[self.submit(session) for session in sessions])
+            return {"ok": True, "accepted": len(sessions)}
+        if op == "top":
+            limit = int(request.get("limit", 10))
+            if limit <= self.cache.size:
+                scores = self.cache.high_scores(limit)
+            else:
+                scores = await self.run_db(self.database.get_high_scores, limit)
+            return {"ok": True, "scores": scores}
+        if op == "player":
+            name = str(request["name"])
+            stats = self.cache.player_stats(name)
+            if stats is None:
+                self.cache.set_player(name, await self.run_db(self.database.get_player_stats, name))
+                stats = self.cache.player_stats(name)
+            return {"ok": True, "stats": stats}
+        if op == "ping":
+            return {"ok": True}
+        raise ValueError(f"Operação desconhecida: {op}")
+
+    def validate(self, session):
+        """Normaliza uma sessão recebida (campos de GameDatabase.save_game_session)"""
+        valid = {field: int(session[field]) for field in SESSION_FIELDS}
+        valid["player_name"] = str(session.get("player_name") or self.default_name)
+        valid["session_date"] = str(session.get("session_date") or current_session_date())
+        seed = session.get("seed")
+        valid["seed"] = None if seed is None else int(seed)
+        valid["id"] = session.get("id")
+        return valid
+
+    def submit(self, session):
+        """Enfileira a sessão e devolve um futuro resolvido após o commit"""
+        session_id = session.pop("id")
+        if session_id is not None:
+            if session_id in self.recent_ids:
+                # Reenvio de uma sessão já gravada (a resposta anterior se perdeu)
+                self.duplicates += 1
+                future = asyncio.get_running_loop().create_future()
+                future.set_result(None)
+                return future
+            if session_id in self.pending:
+                self.duplicates += 1
+                return self.pending[session_id]
+        future = asyncio.get_running_loop().create_future()
+        if session_id is not None:
+            self.pending[session_id] = future
+        self.queue.put_nowait((session, session_id, future))
+        return future
+
+    async def write_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Junta o que já estiver na fila, até batch_size, esperando um pouco por mais
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            sessions = [session for session, _, _ in batch]
+            try:
+                await self.run_db(self.database.save_game_sessions, sessions)
+            except Exception as e:
+                self.errors += 1
+                print(f"Erro ao salvar sessões: {e}")
+                self.finish_batch(batch, e)
+            else:
+                self.sessions_written += len(sessions)
+                self.batches_written += 1
+                for session in sessions:
+                    self.cache.add_session(session)
+                self.finish_batch(batch)
+            for _ in batch:
+                self.queue.task_done()
+
+    def finish_batch(self, batch, error=None):
+        for _, session_id, future in batch:
+            if session_id is not None:
+                self.pending.pop(session_id, None)
+                if error is None:
+                    self.recent_ids[session_id] = None
+                    if len(self.recent_ids) > RECENT_IDS:
+                        self.recent_ids.popitem(last=False)
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+    def get_metrics(self):
+        return {
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "sessions_written": self.sessions_written,
+            "batches_written": self.batches_written,
+            "duplicates": self.duplicates,
+            "errors": self.errors
+        }
+
+
+async def serve(host, port, db_name, batch_size, flush_interval):
+    server = LeaderboardServer(GameDatabase(db_name), batch_size, flush_interval)
+    await server.start(host, port)
+    print(f"Leaderboard em {host}:{port} (banco: {db_name})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+        print(f"Sessões gravadas: {server.sessions_written} em {server.batches_written} lotes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de leaderboard compartilhado - Square Dodger")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db", default="leaderboard.db", help="banco SQLite do leaderboard compartilhado")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--flush-interval", type=float, default=0.05, help="espera máxima (s) para completar um lote")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.db, args.batch_size, args.flush_interval))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        GameDatabase.close_all()
+
+
+if __name__ == "__main__":
+    main()
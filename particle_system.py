@@ -1,42 +1,119 @@
+import numpy as np
 import pygame
-import random
-
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.size = random.randint(2, 5)
-        self.speed_x = random.uniform(-2, 2)
-        self.speed_y = random.uniform(-2, 2)
-        self.life = random.randint(20, 40)
-    
-    def update(self):
-        self.x += self.speed_x
-        self.y += self.speed_y
-        self.life -= 1
-        self.size = max(0, self.size - 0.1)
-        return self.life > 0
-    
-    def draw(self, surface):
-        if self.life > 0:
-            alpha = min(255, self.life * 6)
-            color_with_alpha = (*self.color, alpha)
-            surf = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-            pygame.draw.rect(surf, color_with_alpha, (0, 0, self.size, self.size))
-            surface.blit(surf, (int(self.x), int(self.y)))
+
+# Faixas de alpha usadas pelo cache de quadrados pré-renderizados
+ALPHA_STEP = 16
+
 
 class ParticleSystem:
-    def __init__(self):
-        self.particles = []
-    
+    """Pool de partículas de capacidade fixa, guardadas em arrays NumPy.
+
+    As partículas vivas ficam compactadas em [0, count) e são atualizadas
+    em um único passo vetorizado. O desenho usa quadrados pré-renderizados
+    por (cor, tamanho, faixa de alpha). Quando o pool está cheio, novas
+    explosões geram menos partículas em vez de crescer sem limite.
+    """
+    def __init__(self, capacity=4096, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.dropped = 0
+        self.rng = np.random.default_rng(seed)
+
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.speed_x = np.zeros(capacity)
+        self.speed_y = np.zeros(capacity)
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.size = np.zeros(capacity)
+        self.color_id = np.zeros(capacity, dtype=np.int32)
+
+        self.colors = []
+        self.color_ids = {}
+        self.surface_cache = {}
+
+    def __len__(self):
+        return self.count
+
     def add_explosion(self, x, y, color, count=10):
-        for _ in range(count):
-            self.particles.append(Particle(x, y, color))
-    
+        spawn = min(count, self.capacity - self.count)
+        self.dropped += count - spawn
+        if spawn <= 0:
+            return
+
+        color = tuple(color)
+        if color not in self.color_ids:
+            self.color_ids[color] = len(self.colors)
+            self.colors.append(color)
+
+        start, end = self.count, self.count + spawn
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.size[start:end] = self.rng.integers(2, 6, spawn)
+        self.speed_x[start:end] = self.rng.uniform(-2, 2, spawn)
+        self.speed_y[start:end] = self.rng.uniform(-2, 2, spawn)
+        self.life[start:end] = self.rng.integers(20, 41, spawn)
+        self.color_id[start:end] = self.color_ids[color]
+        self.count = end
+
     def update(self):
-        self.particles = [p for p in self.particles if p.update()]
-    
-    def draw(self, surface):
-        for particle in self.particles:
-            particle.draw(surface)
\ No newline at end of file
+        n = self.count
+        if n == 0:
+            return
+        self.x[:n] += self.speed_x[:n]
+        self.y[:n] += self.speed_y[:n]
+        self.life[:n] -= 1
+        np.maximum(self.size[:n] - 0.1, 0, out=self.size[:n])
+
+        # Compacta as partículas vivas no início dos arrays
+        alive = self.life[:n] > 0
+        kept = int(np.count_nonzero(alive))
+        if kept != n:
+            for values in (self.x, self.y, self.speed_x, self.speed_y,
+                           self.life, self.size, self.color_id):
+                values[:kept] = values[:n][alive]
+        self.count = kept
+
+    def get_surface(self, color_id, size, bucket):
+        key = (color_id, size, bucket)
+        surf = self.surface_cache.get(key)
+        if surf is None:
+            alpha = min(255, (bucket + 1) * ALPHA_STEP)
+            surf = pygame.Surface((size, size), pygame.SRCALPHA)
+            surf.fill((*self.colors[color_id], alpha))
+            self.surface_cache[key] = surf
+        return surf
+
+    def draw(self, surface, offset=(0, 0)):
+        """Desenha as partículas; offset é a posição da câmera no mundo"""
+        n = self.count
+        if n == 0:
+            return
+        sizes = self.size[:n].astype(np.int32)
+        visible = sizes > 0
+        if not visible.any():
+            return
+        buckets = np.minimum(255, self.life[:n] * 6) // ALPHA_STEP
+        xs = self.x[:n].astype(np.int32) - offset[0]
+        ys = self.y[:n].astype(np.int32) - offset[1]
+
+        get_surface = self.get_surface
+        surface.blits([
+            (get_surface(color_id, size, bucket), (x, y))
+            for color_id, size, bucket, x, y in zip(
+                self.color_id[:n][visible].tolist(), sizes[visible].tolist(),
+                buckets[visible].tolist(), xs[visible].tolist(), ys[visible].tolist())
+        ], doreturn=False)
+
+    def get_bounds(self):
+        """Retângulo que envolve todas as partículas vivas, ou None"""
+        n = self.count
+        if n == 0:
+            return None
+        left = int(self.x[:n].min())
+        top = int(self.y[:n].min())
+        right = int(self.x[:n].max()) + int(self.size[:n].max()) + 1
+        bottom = int(self.y[:n].max()) + int(self.size[:n].max()) + 1
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def clear(self):
+        self.count = 0
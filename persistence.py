@@ -0,0 +1,64 @@
+import sqlite3
+import time
+from background_writer import BackgroundWriter
+
+
+class SessionWriter(BackgroundWriter):
+    """Grava sessões no banco em uma thread separada (write-behind).
+
+    submit() só enfileira a sessão, então o game over não espera pelo
+    INSERT nem pelo fsync do commit. A thread agrupa o que estiver na fila
+    em uma única transação por lote. flush() espera a fila esvaziar e
+    close() grava o que faltar e encerra a thread. Falhas passageiras do
+    SQLite (banco travado por outro processo) são repetidas com espera
+    crescente; só o lote que falha em todas as tentativas é perdido, e
+    conta em sessions_lost.
+    """
+    thread_name = "SessionWriter"
+
+    def __init__(self, database, batch_size=64, flush_interval=0.25, retries=3, backoff=0.2):
+        super().__init__(batch_size, flush_interval, retries, backoff)
+        self.database = database
+
+        # Métricas
+        self.sessions_written = 0
+        self.batches_written = 0
+        self.sessions_lost = 0
+        self.last_flush_latency = 0.0
+        self.max_flush_latency = 0.0
+        self.total_flush_latency = 0.0
+
+    def submit(self, **session):
+        """Enfileira uma sessão (mesmos argumentos de GameDatabase.save_game_session)"""
+        super().submit(**session)
+
+    def write_batch(self, batch):
+        start = time.perf_counter()
+        try:
+            # "database is locked" e afins: a transação foi desfeita, dá para repetir
+            self.call_with_retry(sqlite3.OperationalError, self.database.save_game_sessions, batch)
+        except Exception as e:
+            self.errors += 1
+            self.sessions_lost += len(batch)
+            print(f"Erro ao salvar sessões ({len(batch)} perdidas): {e}")
+            return
+        latency = time.perf_counter() - start
+
+        self.sessions_written += len(batch)
+        self.batches_written += 1
+        self.last_flush_latency = latency
+        self.max_flush_latency = max(self.max_flush_latency, latency)
+        self.total_flush_latency += latency
+
+    def get_metrics(self):
+        batches = self.batches_written
+        metrics = super().get_metrics()
+        metrics.update({
+            "sessions_written": self.sessions_written,
+            "batches_written": batches,
+            "sessions_lost": self.sessions_lost,
+            "last_flush_ms": self.last_flush_latency * 1000,
+            "max_flush_ms": self.max_flush_latency * 1000,
+            "avg_flush_ms": self.total_flush_latency / batches * 1000 if batches else 0.0
+        })
+        return metrics
@@ -0,0 +1,154 @@
+import csv
+import json
+import time
+from array import array
+from contextlib import contextmanager
+import pygame
+
+# Fonte do overlay: (nome, tamanho, negrito), aberta pelo FontCache do jogo
+OVERLAY_FONT = ("monospace", 12, False)
+# Limites (ms) das faixas do histograma de tempo de frame; a última é "acima de 100"
+HISTOGRAM_EDGES = (1, 2, 4, 8, 16.7, 33.3, 50, 100)
+
+
+class RingBuffer:
+    """Buffer circular de tamanho fixo para amostras em ms"""
+    def __init__(self, size):
+        self.samples = array("d", bytes(8 * size))
+        self.size = size
+        self.index = 0
+        self.count = 0
+
+    def append(self, value):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def values(self):
+        if self.count < self.size:
+            return self.samples[:self.count].tolist()
+        return self.samples[self.index:].tolist() + self.samples[:self.index].tolist()
+
+    def percentiles(self, *points):
+        values = sorted(self.values())
+        if not values:
+            return tuple(0.0 for _ in points)
+        last = len(values) - 1
+        return tuple(values[min(last, int(round(point / 100 * last)))] for point in points)
+
+
+class FrameProfiler:
+    """Tempos por seção e por frame, em buffers circulares.
+
+    Dentro de um frame, add()/measure() acumulam o tempo de cada seção;
+    end_frame() fecha o frame, guardando os totais e o tempo de frame no
+    histograma. O overlay (F3 no jogo) mostra p50/p95/p99 e export() grava
+    o resumo em JSON ou CSV.
+    """
+    def __init__(self, size=600, refresh_interval=30):
+        self.size = size
+        self.sections = {}
+        self.current = {}
+        self.frame_times = RingBuffer(size)
+        self.histogram = [0] * (len(HISTOGRAM_EDGES) + 1)
+        self.frames = 0
+        self.show_overlay = False
+        self.refresh_interval = refresh_interval
+        self.overlay_lines = []
+        self.font = None
+
+    def add(self, name, seconds):
+        self.current[name] = self.current.get(name, 0.0) + seconds
+
+    @contextmanager
+    def measure(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def end_frame(self, frame_seconds):
+        for name, seconds in self.current.items():
+            buffer = self.sections.get(name)
+            if buffer is None:
+                buffer = self.sections[name] = RingBuffer(self.size)
+            buffer.append(seconds * 1000)
+        self.current.clear()
+
+        frame_ms = frame_seconds * 1000
+        self.frame_times.append(frame_ms)
+        bucket = 0
+        while bucket < len(HISTOGRAM_EDGES) and frame_ms >= HISTOGRAM_EDGES[bucket]:
+            bucket += 1
+        self.histogram[bucket] += 1
+        self.frames += 1
+
+        if self.show_overlay and self.frames % self.refresh_interval == 0:
+            self.overlay_lines = self.format_lines()
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+        if self.show_overlay:
+            self.overlay_lines = self.format_lines()
+
+    def summary(self):
+        sections = {"frame": self.frame_times}
+        sections.update(self.sections)
+        result = {}
+        for name, buffer in sections.items():
+            values = buffer.values()
+            p50, p95, p99 = buffer.percentiles(50, 95, 99)
+            result[name] = {
+                "p50": p50,
+                "p95": p95,
+                "p99": p99,
+                "mean": sum(values) / len(values) if values else 0.0,
+                "max": max(values) if values else 0.0,
+                "samples": len(values)
+            }
+        return result
+
+    def format_lines(self):
+        lines = []
+        for name, stats in self.summary().items():
+            lines.append(f"{name[:18]:<18} {stats['p50']:6.2f} {stats['p95']:6.2f} {stats['p99']:6.2f}")
+        return lines
+
+    def draw_overlay(self, surface, text_cache, fonts):
+        if not self.show_overlay:
+            return None
+        if self.font is None:
+            self.font = fonts.get(*OVERLAY_FONT)
+
+        lines = [f"{'ms':<18} {'p50':>6} {'p95':>6} {'p99':>6}"] + self.overlay_lines
+        line_height = self.font.get_linesize()
+        width = max(text_cache.render(self.font, line, (255, 255, 0)).get_width() for line in lines) + 10
+        rect = pygame.Rect(surface.get_width() - width - 5, 5, width, line_height * len(lines) + 10)
+        surface.fill((0, 0, 0), rect)
+        for i, line in enumerate(lines):
+            surface.blit(text_cache.render(self.font, line, (255, 255, 0)),
+                         (rect.x + 5, rect.y + 5 + i * line_height))
+        return rect
+
+    def export(self, path):
+        """Grava o resumo em JSON ou CSV (pela extensão do arquivo)"""
+        summary = self.summary()
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["section", "p50_ms", "p95_ms", "p99_ms", "mean_ms", "max_ms", "samples"])
+                for name, stats in summary.items():
+                    writer.writerow([name, stats["p50"], stats["p95"], stats["p99"],
+                                     stats["mean"], stats["max"], stats["samples"]])
+                writer.writerow([])
+                writer.writerow(["histogram_upper_ms", "frames"])
+                for edge, count in zip(list(HISTOGRAM_EDGES) + ["inf"], self.histogram):
+                    writer.writerow([edge, count])
+        else:
+            with open(path, "w") as f:
+                json.dump({
+                    "frames": self.frames,
+                    "sections": summary,
+                    "histogram": {"edges_ms": list(HISTOGRAM_EDGES), "counts": self.histogram}
+                }, f, indent=2)
@@ -0,0 +1,360 @@
+import argparse
+import bisect
+import datetime
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from config import GameConfig
+from input_source import KeyState, PolicyInput, ScriptedInput, keys_to_mask
+
+# Arquivo: cabeçalho + blocos. Cada bloco de frames guarda uma máscara de
+# entrada (INPUT_LEFT | INPUT_RIGHT | ...) por frame, comprimida com zlib.
+# O arquivo só cresce (append-only) e um bloco 'E' final guarda o resultado.
+MAGIC = b"SQDR"
+VERSION = 1
+HEADER = struct.Struct("<4sBqI")       # magic, versão, seed, tamanho do JSON de config
+CHUNK = struct.Struct("<cIII")         # tipo, primeiro frame, nº de frames, tamanho do payload
+FRAMES_CHUNK = b"F"
+END_CHUNK = b"E"
+CHUNK_FRAMES = 4096
+
+# Atributos de GameConfig que mudam a simulação e vão no cabeçalho
+REPLAY_CONFIG_KEYS = ("SCREEN_WIDTH", "SCREEN_HEIGHT", "FPS", "PLAYER_SPEED", "MAX_ENEMIES",
+                      "LEVEL_UP_SCORE", "COLLISION_BUFFER", "ENEMY_ENGINE", "ENEMY_SPAWN_WEIGHTS",
+                      "ENEMY_SPEED_STEP", "OSCILLATION_SPEED_STEP", "HOMING_STRENGTH_STEP",
+                      "MAX_HOMING_STRENGTH", "WORLD_WIDTH", "WORLD_HEIGHT", "LOD_DISTANCE",
+                      "LOD_INTERVAL")
+# Campos do resultado final (a sessão gravada em game_sessions) conferidos por verify
+RESULT_KEYS = ("score", "level", "time_played")
+
+
+def replay_path(directory, seed):
+    stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(directory, f"{stamp}_{seed}.sqdr")
+
+
+class ReplayRecorder:
+    """Grava seed + máscara de entrada por frame em blocos comprimidos"""
+    def __init__(self, path, seed, config):
+        self.path = path
+        self.frames = 0
+        self.buffer = bytearray()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        config_json = json.dumps({key: getattr(config, key) for key in REPLAY_CONFIG_KEYS}).encode()
+        self.file = open(path, "ab")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, len(config_json)))
+        self.file.write(config_json)
+
+    def record(self, mask):
+        self.buffer.append(mask)
+        if len(self.buffer) >= CHUNK_FRAMES:
+            self.write_frames()
+
+    def write_frames(self):
+        if not self.buffer:
+            return
+        payload = zlib.compress(bytes(self.buffer), 9)
+        self.file.write(CHUNK.pack(FRAMES_CHUNK, self.frames, len(self.buffer), len(payload)))
+        self.file.write(payload)
+        self.file.flush()
+        self.frames += len(self.buffer)
+        self.buffer.clear()
+
+    def finish(self, result=None):
+        """Grava os frames pendentes e, se houver, o resultado final"""
+        if self.file.closed:
+            return
+        if result is None and self.frames == 0 and not self.buffer:
+            # Sessão que nem começou: não deixa arquivo vazio
+            self.file.close()
+            os.remove(self.path)
+            return
+        self.write_frames()
+        if result is not None:
+            payload = json.dumps(result).encode()
+            self.file.write(CHUNK.pack(END_CHUNK, self.frames, 0, len(payload)))
+            self.file.write(payload)
+        self.file.close()
+
+
+class ReplayReader:
+    """Lê um replay via mmap; só o bloco do frame pedido é descomprimido"""
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.seed, config_size = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Arquivo de replay inválido: {path}")
+        offset = HEADER.size
+        self.config = json.loads(self.data[offset:offset + config_size])
+        offset += config_size
+
+        # Índice dos blocos: lê só os cabeçalhos, pulando os payloads
+        self.chunk_starts = []
+        self.chunks = []
+        self.result = None
+        self.frame_count = 0
+        while offset + CHUNK.size <= len(self.data):
+            kind, first_frame, count, size = CHUNK.unpack_from(self.data, offset)
+            offset += CHUNK.size
+            if offset + size > len(self.data):
+                break  # bloco incompleto (gravação interrompida)
+            if kind == FRAMES_CHUNK:
+                self.chunk_starts.append(first_frame)
+                self.chunks.append((offset, size, count))
+                self.frame_count = first_frame + count
+            elif kind == END_CHUNK:
+                self.result = json.loads(self.data[offset:offset + size])
+            offset += size
+
+        self.cached_chunk = None
+        self.cached_frames = None
+
+    def __len__(self):
+        return self.frame_count
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def load_chunk(self, index):
+        if self.cached_chunk != index:
+            offset, size, _ = self.chunks[index]
+            self.cached_frames = zlib.decompress(self.data[offset:offset + size])
+            self.cached_chunk = index
+        return self.cached_frames
+
+    def get_mask(self, frame):
+        """Máscara de entrada do frame (0 depois do fim do replay)"""
+        if frame < 0 or frame >= self.frame_count:
+            return 0
+        index = bisect.bisect_right(self.chunk_starts, frame) - 1
+        return self.load_chunk(index)[frame - self.chunk_starts[index]]
+
+    def masks(self, start=0):
+        """Itera as máscaras a partir de um frame"""
+        if start >= self.frame_count:
+            return
+        index = bisect.bisect_right(self.chunk_starts, max(0, start)) - 1
+        skip = max(0, start) - self.chunk_starts[index]
+        for chunk in range(index, len(self.chunks)):
+            frames = self.load_chunk(chunk)
+            yield from frames[skip:]
+            skip = 0
+
+    def create_config(self):
+        config = GameConfig()
+        for key, value in self.config.items():
+            setattr(config, key, value)
+        # Assistir ou re-simular um replay não gera sessão nova nem telemetria
+        config.RECORD_REPLAYS = False
+        config.TELEMETRY_ENABLED = False
+        return config
+
+
+class ReplayInput:
+    """input_source que reproduz as máscaras de um replay"""
+    def __init__(self, reader, start=0):
+        self.masks = reader.masks(start)
+
+    def get_keys(self, game):
+        return KeyState(next(self.masks, 0))
+
+
+def fast_forward(reader, frame=None):
+    """Re-simula o replay sem janela até o frame dado (ou até o fim)"""
+    from headless import HeadlessGame
+
+    game = HeadlessGame(ReplayInput(reader), reader.create_config(), reader.seed)
+    game.run(reader.frame_count if frame is None else frame)
+    return game
+
+
+def verify(path, database=None):
+    """Re-simula o replay e confere o resultado gravado no fim do replay e,
+    com database, a sessão de mesma seed em game_sessions.
+
+    Devolve (ok, sessão re-simulada ou None, resultado do replay, linha do banco, frames/s).
+    """
+    reader = ReplayReader(path)
+    try:
+        start = time.perf_counter()
+        game = fast_forward(reader)
+        elapsed = time.perf_counter() - start
+        session = game.saved_session
+        expected = reader.result
+        ok = (session is not None and expected is not None
+              and all(expected.get(key) == session[key] for key in RESULT_KEYS))
+        saved = None
+        if database is not None:
+            rows = database.get_sessions_by_seed(reader.seed)
+            # A mesma seed pode ter outras sessões; vale a que tem o resultado do replay
+            saved = next((row for row in rows if session is not None
+                          and (row[0], row[1]) == (session["score"], session["level"])), None)
+            ok = ok and saved is not None
+        fps = game.frame_count / elapsed if elapsed else 0.0
+        return ok, session, expected, saved, fps
+    finally:
+        reader.close()
+
+
+class MaskRecorder:
+    """input_source que repassa a entrada de outro e guarda a máscara de cada frame"""
+    def __init__(self, source):
+        self.source = source
+        self.masks = []
+
+    def get_keys(self, game):
+        keys = self.source.get_keys(game)
+        self.masks.append(keys_to_mask(keys))
+        return keys
+
+
+def check_resets(config, seeds, policy="dodge", max_frames=None):
+    """Joga as sessões em sequência num único jogo (reset_game entre elas) e
+    re-simula cada uma num jogo novo com a mesma seed e entrada.
+
+    Devolve as sessões divergentes: (seed, resultado após reset, resultado novo).
+    """
+    from bots import create_policy
+    from headless import HeadlessGame
+
+    source = MaskRecorder(PolicyInput(create_policy(policy, seeds[0])))
+    game = HeadlessGame(source, config, seeds[0])
+    mismatches = []
+    for i, seed in enumerate(seeds):
+        if i:
+            game.reset_game(seed)
+        source.masks = []
+        result = game.run(max_frames)
+        fresh = HeadlessGame(ScriptedInput(source.masks), config, seed).run(max_frames)
+        if result != fresh:
+            mismatches.append((seed, result, fresh))
+    return mismatches
+
+
+def check_lod(config, seeds, updates=10):
+    """Confere que um inimigo atualizado a cada LOD_INTERVAL passos (update(interval))
+    segue a mesma trajetória que o atualizado em todos os passos.
+
+    Devolve as divergências: (tipo, seed, posição a cada passo, posição com LOD).
+    """
+    import random
+    import pygame
+    import entities.enemy  # registra os tipos
+    from enemy_registry import ENEMY_TYPES
+
+    interval = config.LOD_INTERVAL
+    # pygame.Rect trunca o deslocamento fracionário a cada update: até 1 px por passo pulado
+    tolerance = updates * (interval - 1)
+    # Arena grande o bastante para o inimigo não sair (sair sorteia um novo spawn)
+    size = 100000
+    mismatches = []
+    for enemy_type, enemy_class in ENEMY_TYPES.items():
+        for seed in seeds:
+            every_step = enemy_class(size, size, rng=random.Random(seed))
+            lod = enemy_class(size, size, rng=random.Random(seed))
+            if enemy_class.tracks_player:
+                every_step.set_player_rect(pygame.Rect(0, 0, 30, 30))
+                lod.set_player_rect(pygame.Rect(0, 0, 30, 30))
+            for _ in range(updates * interval):
+                every_step.update()
+            for _ in range(updates):
+                lod.update(interval)
+            if (abs(every_step.rect.x - lod.rect.x) > tolerance
+                    or abs(every_step.rect.y - lod.rect.y) > tolerance):
+                mismatches.append((enemy_type, seed, every_step.rect.topleft, lod.rect.topleft))
+    return mismatches
+
+
+def play(path, start=0):
+    """Reproduz o replay em tempo real, com janela"""
+    from game import Game
+    from game_state import GameStats
+
+    class ReplayGame(Game):
+        def create_stats(self):
+            # Como no HeadlessGame: a partida reproduzida não é gravada no banco
+            return GameStats(persist=False)
+
+    reader = ReplayReader(path)
+    game = ReplayGame(ReplayInput(reader), reader.create_config(), reader.seed)
+    # Avança sem desenhar até o frame inicial
+    for _ in range(start):
+        game.update()
+    try:
+        return game.run()
+    finally:
+        reader.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replays do Square Dodger")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("info").add_argument("paths", nargs="+")
+    verify_parser = subparsers.add_parser("verify")
+    verify_parser.add_argument("paths", nargs="+")
+    verify_parser.add_argument("--db", default="game_stats.db", help="banco com as sessões gravadas")
+    verify_parser.add_argument("--no-db", action="store_true", help="confere só o resultado gravado no replay")
+    play_parser = subparsers.add_parser("play")
+    play_parser.add_argument("path")
+    play_parser.add_argument("--from", dest="start", type=int, default=0)
+    check_parser = subparsers.add_parser(
+        "check", help="confere que sessões após reset_game reproduzem como um jogo novo "
+                      "e que o LOD da arena não muda a trajetória dos inimigos")
+    check_parser.add_argument("--sessions", type=int, default=20)
+    check_parser.add_argument("--seed", type=int, default=0)
+    check_parser.add_argument("--max-frames", type=int, default=20000)
+    check_parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="CHAVE=VALOR",
+                              help="sobrescreve um atributo de GameConfig (valor em JSON)")
+    args = parser.parse_args()
+
+    if args.command == "play":
+        play(args.path, args.start)
+    elif args.command == "check":
+        from batch import build_config, parse_assignment
+
+        config = build_config(dict(parse_assignment(text) for text in args.overrides))
+        seeds = list(range(args.seed, args.seed + args.sessions))
+        mismatches = check_resets(config, seeds, max_frames=args.max_frames)
+        for seed, result, fresh in mismatches:
+            print(f"FALHOU seed {seed}: após reset {result['score']}, jogo novo {fresh['score']}")
+        print(f"{len(seeds) - len(mismatches)}/{len(seeds)} sessões reproduzidas")
+        lod_mismatches = check_lod(config, seeds)
+        for enemy_type, seed, expected, position in lod_mismatches:
+            print(f"FALHOU LOD {enemy_type} seed {seed}: a cada passo {expected}, com LOD {position}")
+        print(f"LOD: {len(lod_mismatches)} trajetórias divergentes")
+        raise SystemExit(1 if mismatches or lod_mismatches else 0)
+    elif args.command == "info":
+        for path in args.paths:
+            reader = ReplayReader(path)
+            print(f"{path}: seed {reader.seed}, {reader.frame_count} frames, resultado {reader.result}")
+            reader.close()
+    else:
+        from database import GameDatabase
+
+        database = None if args.no_db else GameDatabase(args.db)
+        failures = 0
+        for path in args.paths:
+            ok, session, expected, saved, fps = verify(path, database)
+            failures += not ok
+            status = "OK" if ok else "FALHOU"
+            score = session and session["score"]
+            line = f"{status} {path}: score {score} (replay {expected and expected['score']}"
+            if database is not None:
+                line += f", banco {saved and saved[0]}"
+            print(f"{line}), {fps:.0f} frames/s")
+        GameDatabase.close_all()
+        raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import random
+import numpy as np
+
+# Subsistemas com gerador próprio: consumir números em um não altera os outros
+STREAMS = ("spawn", "enemies", "particles", "enemy_store")
+
+
+def new_seed():
+    """Seed aleatória (não determinística) para uma nova sessão"""
+    return random.SystemRandom().randrange(2 ** 31)
+
+
+class RandomStreams:
+    """Geradores determinísticos por subsistema, derivados de uma seed de sessão.
+
+    spawn: escolha do tipo de inimigo (EnemyFactory)
+    enemies: posições, velocidades e comportamento das entidades
+    particles / enemy_store: geradores NumPy, com sorteios em lote
+
+    reseed() troca a seed sem criar objetos novos, então entidades que
+    guardam referência aos geradores continuam válidas entre sessões.
+    """
+    def __init__(self, seed=None):
+        self.spawn = random.Random()
+        self.enemies = random.Random()
+        self.particles = np.random.default_rng()
+        self.enemy_store = np.random.default_rng()
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        self.seed = new_seed() if seed is None else seed
+        self.spawn.seed(f"{self.seed}:spawn")
+        self.enemies.seed(f"{self.seed}:enemies")
+        for index, name in enumerate(STREAMS):
+            generator = getattr(self, name)
+            if isinstance(generator, np.random.Generator):
+                generator.bit_generator.state = np.random.PCG64([self.seed, index]).state
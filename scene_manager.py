@@ -0,0 +1,122 @@
+import threading
+import time
+import pygame
+from config import GameConfig
+from database import GameDatabase
+from leaderboard_client import LeaderboardClient
+from text_cache import FontCache, TextCache
+
+
+def open_window(config):
+    """Janela, relógio, fontes e cache de textos; o mesmo setup do SceneManager e do Game sem app"""
+    # Só os módulos usados: sem áudio, joystick etc.
+    pygame.display.init()
+    pygame.font.init()
+    window = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+    pygame.display.set_caption(config.WINDOW_TITLE)
+    return window, pygame.time.Clock(), FontCache(config.FONT_CACHE_FILE), TextCache()
+
+
+class SceneManager:
+    """Dono dos recursos do processo e da troca entre cenas.
+
+    Janela, relógio, fontes, cache de textos, banco e cliente do leaderboard
+    são criados uma vez e compartilhados pelas cenas; trocar de cena não
+    recria nada. Cada cena tem run(manager), que devolve o nome da próxima
+    cena ou None para sair, e opcionalmente prewarm(manager), executado em
+    segundo plano enquanto a primeira cena já está na tela.
+    """
+    def __init__(self, config=None, start_time=None):
+        self.config = config or GameConfig()
+        self.start_time = time.perf_counter() if start_time is None else start_time
+        self.first_frame_ms = None
+        self.window, self.clock, self.fonts, self.text_cache = open_window(self.config)
+        self.database = None
+        self.leaderboard = None
+        self.scenes = {}
+        self.prewarm_thread = None
+
+    def add_scene(self, name, scene):
+        self.scenes[name] = scene
+
+    def get_database(self):
+        # GameDatabase compartilha a conexão por arquivo, então uma corrida aqui é inofensiva
+        if self.database is None:
+            self.database = GameDatabase()
+        return self.database
+
+    def get_leaderboard_client(self):
+        """Cliente do leaderboard compartilhado (None se LEADERBOARD_SERVER não está definido).
+
+        Vive enquanto o processo: voltar ao menu não espera o envio das sessões.
+        """
+        if self.leaderboard is None and self.config.LEADERBOARD_SERVER:
+            self.leaderboard = LeaderboardClient.from_address(
+                self.config.LEADERBOARD_SERVER, self.config.LEADERBOARD_SPOOL,
+                self.get_database().get_setting("player_name"))
+        return self.leaderboard
+
+    def start_prewarm(self):
+        scenes = [scene for scene in self.scenes.values() if hasattr(scene, "prewarm")]
+        self.prewarm_thread = threading.Thread(
+            target=lambda: [scene.prewarm(self) for scene in scenes], name="Prewarm", daemon=True)
+        self.prewarm_thread.start()
+
+    def wait_prewarm(self):
+        if self.prewarm_thread is not None:
+            self.prewarm_thread.join()
+
+    def frame_presented(self):
+        """Chamado pelas cenas após o flip; registra o tempo até o primeiro frame"""
+        if self.first_frame_ms is None:
+            self.first_frame_ms = (time.perf_counter() - self.start_time) * 1000
+            print(f"Primeiro frame em {self.first_frame_ms:.0f} ms")
+
+    def run(self, start):
+        name = start
+        self.start_prewarm()
+        try:
+            while name is not None:
+                name = self.scenes[name].run(self)
+        finally:
+            self.close()
+
+    def close(self):
+        self.wait_prewarm()
+        if self.leaderboard is not None:
+            self.leaderboard.close(self.config.LEADERBOARD_CLOSE_TIMEOUT)
+        GameDatabase.close_all()
+        pygame.quit()
+
+
+class GameScene:
+    """Cena do jogo: o Game é criado na primeira entrada e reiniciado nas seguintes"""
+    def __init__(self, menu_scene="menu"):
+        self.menu_scene = menu_scene
+        self.game = None
+
+    def prewarm(self, manager):
+        """Importa o jogo (NumPy incluso), abre o banco e resolve as fontes do HUD"""
+        import game
+        manager.get_database().get_top_score()
+        for name, _, bold in (game.HUD_FONT, game.BIG_FONT):
+            manager.fonts.resolve(name, bold)
+
+    def run(self, manager):
+        manager.wait_prewarm()
+        from game import Game
+
+        try:
+            if self.game is None:
+                self.game = Game(config=manager.config, app=manager)
+            else:
+                self.game.reset_game()
+            result = self.game.run()
+        except Exception as e:
+            print(f"Erro durante o jogo: {e}")
+            # Estado do jogo desconhecido: recria na próxima entrada
+            self.game = None
+            return self.menu_scene
+
+        # Se o jogo retornou "MENU", volta para o menu; senão encerra
+        return self.menu_scene if result == "MENU" else None
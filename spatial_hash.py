@@ -0,0 +1,168 @@
+import heapq
+
+
+def rects_overlap(ax, ay, aw, ah, bx, by, bw, bh):
+    """Mesmo teste de pygame.Rect.colliderect, sem criar Rects"""
+    if aw <= 0 or ah <= 0 or bw <= 0 or bh <= 0:
+        return False
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+class SpatialHash:
+    """Broad phase em grade uniforme para consultas de colisão.
+
+    Cada entrada (qualquer chave hashável) ocupa todas as células que o seu
+    retângulo cobre. update() só mexe nas células quando a entrada muda de
+    faixa de células, então mover entidades dentro da mesma célula custa O(1).
+    """
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def cell_range(self, x, y, w, h):
+        size = self.cell_size
+        return (int(x // size), int(y // size),
+                int((x + max(w, 1) - 1) // size), int((y + max(h, 1) - 1) // size))
+
+    def update(self, key, x, y, w, h):
+        """Insere ou move uma entrada"""
+        new_range = self.cell_range(x, y, w, h)
+        entry = self.entries.get(key)
+        if entry is not None and entry[4] == new_range:
+            entry[0], entry[1], entry[2], entry[3] = x, y, w, h
+            return
+        if entry is not None:
+            self.unlink(key, entry[4])
+        self.entries[key] = [x, y, w, h, new_range]
+        cx0, cy0, cx1, cy1 = new_range
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is None:
+                    self.cells[(cx, cy)] = [key]
+                else:
+                    cell.append(key)
+
+    def remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.unlink(key, entry[4])
+
+    def unlink(self, key, cell_range):
+        cx0, cy0, cx1, cy1 = cell_range
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = self.cells[(cx, cy)]
+                cell.remove(key)
+                if not cell:
+                    del self.cells[(cx, cy)]
+
+    def clear(self):
+        self.cells.clear()
+        self.entries.clear()
+
+    def query_rect(self, x, y, w, h, buffer=0):
+        """Chaves cujos retângulos (expandidos por buffer) sobrepõem o retângulo dado"""
+        margin = max(0, buffer)
+        cx0, cy0, cx1, cy1 = self.cell_range(x - margin, y - margin,
+                                             w + margin * 2, h + margin * 2)
+        found = []
+        entries = self.entries
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is None:
+                    continue
+                for key in cell:
+                    ex, ey, ew, eh, cells = entries[key]
+                    if not rects_overlap(x, y, w, h, ex - buffer, ey - buffer,
+                                         ew + buffer * 2, eh + buffer * 2):
+                        continue
+                    # Reporta só na primeira célula em comum, evitando duplicatas
+                    if max(cx0, cells[0]) == cx and max(cy0, cells[1]) == cy:
+                        found.append(key)
+        return found
+
+    def first_overlap(self, x, y, w, h, buffer=0):
+        """Primeira chave que sobrepõe o retângulo dado, ou None"""
+        margin = max(0, buffer)
+        cx0, cy0, cx1, cy1 = self.cell_range(x - margin, y - margin,
+                                             w + margin * 2, h + margin * 2)
+        entries = self.entries
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for key in self.cells.get((cx, cy), ()):
+                    ex, ey, ew, eh, _ = entries[key]
+                    if rects_overlap(x, y, w, h, ex - buffer, ey - buffer,
+                                     ew + buffer * 2, eh + buffer * 2):
+                        return key
+        return None
+
+    def all_pairs(self, buffer=0):
+        """Todos os pares de entradas que colidem entre si.
+
+        Pensado para buffer <= 0 (como GameConfig.COLLISION_BUFFER): pares que
+        só se tocam graças a um buffer positivo e não dividem célula não aparecem.
+        """
+        pairs = []
+        entries = self.entries
+        for (cx, cy), cell in self.cells.items():
+            count = len(cell)
+            for i in range(count):
+                a = cell[i]
+                ax, ay, aw, ah, a_cells = entries[a]
+                ax, ay, aw, ah = ax - buffer, ay - buffer, aw + buffer * 2, ah + buffer * 2
+                for j in range(i + 1, count):
+                    b = cell[j]
+                    bx, by, bw, bh, b_cells = entries[b]
+                    bx, by, bw, bh = bx - buffer, by - buffer, bw + buffer * 2, bh + buffer * 2
+                    if not rects_overlap(ax, ay, aw, ah, bx, by, bw, bh):
+                        continue
+                    # Reporta só na primeira célula que as duas entradas dividem
+                    if max(a_cells[0], b_cells[0]) == cx and max(a_cells[1], b_cells[1]) == cy:
+                        pairs.append((a, b))
+        return pairs
+
+    def nearest(self, px, py, n=1):
+        """As n chaves cujos centros estão mais próximos do ponto"""
+        if not self.entries or n <= 0:
+            return []
+        size = self.cell_size
+        qx, qy = int(px // size), int(py // size)
+        min_cx = min(cx for cx, _ in self.cells)
+        max_cx = max(cx for cx, _ in self.cells)
+        min_cy = min(cy for _, cy in self.cells)
+        max_cy = max(cy for _, cy in self.cells)
+        max_ring = max(abs(qx - min_cx), abs(qx - max_cx), abs(qy - min_cy), abs(qy - max_cy))
+
+        entries = self.entries
+        best = {}
+        ring = 0
+        while ring <= max_ring:
+            for cx in range(qx - ring, qx + ring + 1):
+                for cy in range(qy - ring, qy + ring + 1):
+                    if ring and qx - ring < cx < qx + ring and qy - ring < cy < qy + ring:
+                        continue
+                    for key in self.cells.get((cx, cy), ()):
+                        if key in best:
+                            continue
+                        ex, ey, ew, eh, _ = entries[key]
+                        dx = ex + ew / 2 - px
+                        dy = ey + eh / 2 - py
+                        best[key] = dx * dx + dy * dy
+            # Entradas não visitadas têm centro a mais de ring * cell_size do ponto
+            if len(best) >= n:
+                limit = (ring * size) ** 2
+                closest = heapq.nsmallest(n, best.items(), key=lambda item: item[1])
+                if closest[-1][1] <= limit:
+                    return [key for key, _ in closest]
+            ring += 1
+        closest = heapq.nsmallest(n, best.items(), key=lambda item: item[1])
+        return [key for key, _ in closest]
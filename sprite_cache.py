@@ -0,0 +1,28 @@
+import pygame
+
+
+class SpriteCache:
+    """Superfícies das entidades, geradas uma vez por (classe, cor, tamanho).
+
+    A classe da entidade define a aparência em bake_sprite(color, size);
+    as superfícies são convertidas para o formato da tela, o que deixa o
+    blit mais barato, e desenhadas em lote com Surface.blits.
+    """
+    def __init__(self):
+        self.sprites = {}
+
+    def get(self, entity_class, color, size):
+        key = (entity_class, color, size)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = entity_class.bake_sprite(color, size)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert_alpha() if sprite.get_flags() & pygame.SRCALPHA else sprite.convert()
+            self.sprites[key] = sprite
+        return sprite
+
+    def get_for(self, entity):
+        return self.get(type(entity), entity.color, entity.rect.size)
+
+    def clear(self):
+        self.sprites.clear()
@@ -1,5 +1,14 @@
+import argparse
+import csv
+import itertools
+import json
 import sqlite3
-from database import GameDatabase
+import sys
+from database import GameDatabase, SESSION_COLUMNS
+from telemetry import EVENT_NAMES
+
+# Linhas por página nas listagens interativas
+PAGE_SIZE = 20
 
 class StatsViewer:
     def __init__(self):
@@ -35,16 +44,82 @@ class StatsViewer:
     def show_recent_games(self, days=7):
         """Exibe jogos recentes"""
         print(f"\n=== JOGOS DOS ÚLTIMOS {days} DIAS ===")
-        recent_games = self.db.get_game_history(days)
+        recent_games = self.db.iter_game_history(days)
         
-        if not recent_games:
-            print("Nenhum jogo encontrado neste período!")
-            return
+        # Mostra uma página por vez; o banco só é lido conforme as páginas são pedidas
+        shown = 0
+        while True:
+            page = list(itertools.islice(recent_games, PAGE_SIZE))
+            for date, player, score, level in page:
+                print(f"{date}: {player} - {score} pontos (Nível {level})")
+            shown += len(page)
+            if len(page) < PAGE_SIZE:
+                break
+            if input(f"-- {shown} jogos. Enter para mais, 'q' para parar: ").strip().lower() == "q":
+                recent_games.close()
+                break
         
-        for date, player, score, level in recent_games:
-            print(f"{date}: {player} - {score} pontos (Nível {level})")
+        if shown == 0:
+            print("Nenhum jogo encontrado neste período!")
+
+def show_telemetry():
+    """Resumo dos eventos de telemetria por tipo de evento e de inimigo"""
+    db = GameDatabase()
+    summary = db.get_telemetry_summary()
+    if not summary:
+        print("Nenhum evento de telemetria registrado ainda!")
+        return
+    print("=== TELEMETRIA ===")
+    for event, enemy_type, count, average in summary:
+        print(f"{EVENT_NAMES.get(event, event):>10} {enemy_type or '-':>10}: {count:>8} eventos, valor médio {average:.1f}")
+
+def rebuild_summaries():
+    """Recalcula agregados e leaderboard (repara divergências)"""
+    db = GameDatabase()
+    db.rebuild_summaries()
+    print("Agregados e leaderboard recalculados!")
+
+def export_sessions(output, fmt):
+    """Grava game_sessions em CSV ou JSON Lines, linha a linha (memória constante)"""
+    db = GameDatabase()
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(output)
+        writer.writerow(SESSION_COLUMNS)
+        for row in db.iter_sessions():
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in db.iter_sessions():
+            output.write(json.dumps(dict(zip(SESSION_COLUMNS, row))) + "\n")
+            count += 1
+    return count
 
 def main():
+    parser = argparse.ArgumentParser(description="Visualizador de estatísticas - Square Dodger")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("rebuild", help="recalcula os agregados por jogador e o leaderboard")
+    subparsers.add_parser("telemetry", help="resumo dos eventos de telemetria (desvios, quase-colisões, mortes)")
+    export_parser = subparsers.add_parser("export", help="exporta todas as sessões (CSV ou JSON Lines)")
+    export_parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    export_parser.add_argument("--output", help="arquivo de saída (padrão: saída padrão)")
+    args = parser.parse_args()
+    
+    if args.command == "rebuild":
+        rebuild_summaries()
+        return
+    if args.command == "telemetry":
+        show_telemetry()
+        return
+    if args.command == "export":
+        if args.output:
+            with open(args.output, "w", newline="") as output:
+                count = export_sessions(output, args.format)
+            print(f"{count} sessões exportadas para {args.output}")
+        else:
+            export_sessions(sys.stdout, args.format)
+        return
+    
     viewer = StatsViewer()
     
     while True:
@@ -0,0 +1,155 @@
+import queue
+import threading
+import time
+from array import array
+
+# Tipos de evento (coluna event de telemetry_events)
+DODGE = 0       # inimigo saiu da tela sem acertar o jogador; valor: velocidade do inimigo
+NEAR_MISS = 1   # inimigo passou a menos de NEAR_MISS_MARGIN do jogador; valor: frames dentro da margem
+LEVEL_UP = 2    # valor: novo nível
+KILL = 3        # inimigo que encerrou a partida; valor: score final
+EVENT_NAMES = {DODGE: "dodge", NEAR_MISS: "near_miss", LEVEL_UP: "level_up", KILL: "kill"}
+
+_STOP = object()
+
+
+class EventBuffer:
+    """Colunas de tamanho fixo (frame, evento, tipo de inimigo, valor) de uma sessão"""
+    __slots__ = ("capacity", "seed", "count", "frame", "event", "enemy_type", "value")
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.seed = None
+        self.count = 0
+        self.frame = array("l", [0]) * capacity
+        self.event = array("b", [0]) * capacity
+        # Índice em Telemetry.type_names (-1: evento sem inimigo)
+        self.enemy_type = array("h", [0]) * capacity
+        self.value = array("d", [0.0]) * capacity
+
+
+class Telemetry:
+    """Log de eventos de jogo em buffers colunares, gravado no banco em lote.
+
+    record() só escreve nas colunas do buffer atual, sem alocar. Quando o
+    buffer enche (ou a sessão muda), ele vai para a thread de escrita e o
+    próximo buffer livre assume. Se nenhum estiver livre (banco lento), os
+    eventos são descartados e contados em events_dropped: memória e custo
+    por frame ficam limitados.
+    """
+    def __init__(self, database, capacity=4096, buffers=4):
+        self.database = database
+        self.type_ids = {}
+        self.type_names = []
+        self.seed = None
+        self.free = queue.Queue()
+        for _ in range(buffers):
+            self.free.put(EventBuffer(capacity))
+        self.queue = queue.Queue()
+        self.thread = None
+        self.buffer = self.take_buffer()
+
+        # Métricas
+        self.events_recorded = 0
+        self.events_dropped = 0
+        self.events_written = 0
+        self.batches_written = 0
+        self.errors = 0
+        self.max_flush_latency = 0.0
+
+    def take_buffer(self):
+        try:
+            buffer = self.free.get_nowait()
+        except queue.Empty:
+            return None
+        buffer.seed = self.seed
+        buffer.count = 0
+        return buffer
+
+    def type_id(self, enemy_type):
+        if enemy_type is None:
+            return -1
+        type_id = self.type_ids.get(enemy_type)
+        if type_id is None:
+            type_id = self.type_ids[enemy_type] = len(self.type_names)
+            self.type_names.append(enemy_type)
+        return type_id
+
+    def record(self, event, frame, enemy_type=None, value=0.0):
+        buffer = self.buffer
+        if buffer is None:
+            # Todos os buffers esperando a gravação: descarta em vez de travar o frame
+            buffer = self.buffer = self.take_buffer()
+            if buffer is None:
+                self.events_dropped += 1
+                return
+        i = buffer.count
+        buffer.frame[i] = frame
+        buffer.event[i] = event
+        buffer.enemy_type[i] = self.type_id(enemy_type)
+        buffer.value[i] = value
+        buffer.count = i + 1
+        self.events_recorded += 1
+        if buffer.count == buffer.capacity:
+            self.flush()
+
+    def start_session(self, seed):
+        """Eventos seguintes pertencem à sessão com esta seed"""
+        self.flush()
+        self.seed = seed
+        if self.buffer is not None:
+            self.buffer.seed = seed
+
+    def flush(self):
+        """Entrega o buffer atual à thread de escrita (não espera a gravação)"""
+        buffer = self.buffer
+        if buffer is None or buffer.count == 0:
+            return
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self.run, name="TelemetryWriter", daemon=True)
+            self.thread.start()
+        self.queue.put(buffer)
+        self.buffer = self.take_buffer()
+
+    def run(self):
+        while True:
+            buffer = self.queue.get()
+            if buffer is _STOP:
+                return
+            self.write_buffer(buffer)
+            self.free.put(buffer)
+
+    def write_buffer(self, buffer):
+        n = buffer.count
+        names = self.type_names
+        rows = zip([buffer.seed] * n, buffer.frame[:n], buffer.event[:n],
+                   [names[t] if t >= 0 else None for t in buffer.enemy_type[:n]],
+                   buffer.value[:n])
+        start = time.perf_counter()
+        try:
+            self.database.save_telemetry_events(rows)
+        except Exception as e:
+            self.errors += 1
+            print(f"Erro ao salvar telemetria: {e}")
+            return
+        self.max_flush_latency = max(self.max_flush_latency, time.perf_counter() - start)
+        self.events_written += n
+        self.batches_written += 1
+
+    def close(self):
+        """Grava o que estiver pendente e encerra a thread"""
+        self.flush()
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.put(_STOP)
+            self.thread.join()
+        self.thread = None
+
+    def get_metrics(self):
+        return {
+            "events_recorded": self.events_recorded,
+            "events_dropped": self.events_dropped,
+            "events_written": self.events_written,
+            "batches_written": self.batches_written,
+            "errors": self.errors,
+            "max_flush_ms": self.max_flush_latency * 1000
+        }
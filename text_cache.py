@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+import pygame
+
+
+class FontCache:
+    """Fontes do sistema por (nome, tamanho, negrito).
+
+    Cada nome é resolvido uma vez para o caminho do arquivo (a primeira
+    busca enumera todas as fontes do sistema, o que é lento no Linux). Os
+    caminhos ficam em path_file e as próximas execuções abrem o arquivo
+    direto, sem enumerar.
+    """
+    def __init__(self, path_file=None):
+        self.fonts = {}
+        self.path_file = path_file
+        self.paths = self.load_paths()
+        self.lock = threading.Lock()
+
+    def load_paths(self):
+        if not self.path_file:
+            return {}
+        try:
+            with open(self.path_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_paths(self):
+        if not self.path_file:
+            return
+        try:
+            with open(self.path_file, "w") as f:
+                json.dump(self.paths, f, indent=2)
+        except OSError:
+            pass
+
+    def resolve(self, name, bold=False):
+        """(caminho do arquivo ou None para a fonte padrão, se o negrito é sintetizado)"""
+        key = f"{name}:{'bold' if bold else 'regular'}"
+        with self.lock:
+            entry = self.paths.get(key)
+            if entry is not None and (entry[0] is None or os.path.exists(entry[0])):
+                return entry
+            path = pygame.font.match_font(name, bold=bold)
+            # Sem arquivo próprio para o negrito, o pygame o simula (como no SysFont)
+            synthetic_bold = bold and (path is None or path == pygame.font.match_font(name))
+            entry = self.paths[key] = [path, synthetic_bold]
+            self.save_paths()
+            return entry
+
+    def get(self, name, size, bold=False):
+        key = (name, size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            path, synthetic_bold = self.resolve(name, bold)
+            font = pygame.font.Font(path, size)
+            if synthetic_bold:
+                font.set_bold(True)
+            self.fonts[key] = font
+        return font
+
+
+class TextCache:
+    """Cache LRU de superfícies de texto, por (fonte, texto, antialias, cor)"""
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, antialias, color)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.surfaces.move_to_end(key)
+            return surf
+
+        surf = font.render(text, antialias, color)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+class NumberText:
+    """Rótulo fixo seguido de um número, desenhado glifo a glifo.
+
+    O rótulo e os dígitos 0-9 ficam no TextCache, então o custo por frame
+    é só um blit por caractere, mesmo quando o número muda todo frame.
+    """
+    def __init__(self, cache, font, color, prefix="", suffix=""):
+        self.cache = cache
+        self.font = font
+        self.color = color
+        self.prefix = prefix
+        self.suffix = suffix
+
+    def draw(self, surface, value, pos):
+        """Desenha o texto e devolve o retângulo ocupado"""
+        x, y = pos
+        cache, font, color = self.cache, self.font, self.color
+        if self.prefix:
+            label = cache.render(font, self.prefix, color)
+            surface.blit(label, (x, y))
+            x += label.get_width()
+        for char in str(value):
+            glyph = cache.render(font, char, color)
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+        if self.suffix:
+            label = cache.render(font, self.suffix, color)
+            surface.blit(label, (x, y))
+            x += label.get_width()
+        return pygame.Rect(pos[0], y, x - pos[0], self.font.get_linesize())